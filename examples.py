@@ -0,0 +1,116 @@
+"""Runnable demos for the universal scraper.
+
+Each ``example_*`` coroutine submits one canned search request and prints a
+short summary of what came back. ``run_all_examples`` runs every demo and
+writes an aggregate ``demo_summary.json``.
+"""
+
+import asyncio
+
+import orjson
+
+from universal_scraper import UniversalSearchRequest, universal_scraper
+
+# Request objects are built once at import time so pydantic validation is
+# paid once, not on every call. Requests are immutable by convention.
+_PRODUCT_REQUEST = UniversalSearchRequest(
+    search_query="solid oak dining table 200cm",
+    custom_fields=["price", "dimensions"],
+    include_keywords=["oak", "table"],
+    exclude_keywords=["veneer", "laminate"],
+    max_results=10,
+    output_formats=["json", "csv"],
+    output_prefix="product_results",
+)
+
+_CONTACT_REQUEST = UniversalSearchRequest(
+    search_query="carpentry workshop contact Lisburn",
+    custom_fields=["phone_number", "email_address"],
+    countries=["United Kingdom"],
+    max_results=10,
+    output_formats=["json"],
+    output_prefix="contact_results",
+)
+
+_COMPANY_REQUEST = UniversalSearchRequest(
+    search_query="IT services company WordPress development",
+    custom_fields=["email_address", "phone_number"],
+    cities=["Vilnius"],
+    countries=["Lithuania"],
+    max_results=10,
+    output_formats=["json"],
+    output_prefix="company_results",
+)
+
+
+async def example_product_search():
+    """Search for a product and extract price/dimension fields."""
+    print("🛒 Example: product search")
+    results = await universal_scraper.search_and_scrape(_PRODUCT_REQUEST)
+    print(f"   Found {results['total_results']} results")
+    if results["results"]:
+        sample = results["results"][0]
+        print(f"   Sample: {sample.get('name', 'N/A')} — {sample.get('price', 'N/A')}")
+    return results
+
+
+async def example_contact_search():
+    """Search for business contact details."""
+    print("📇 Example: contact search")
+    results = await universal_scraper.search_and_scrape(_CONTACT_REQUEST)
+    print(f"   Found {results['total_results']} results")
+    if results["results"]:
+        sample = results["results"][0]
+        print(f"   Sample: {sample.get('phone_number', 'N/A')} / {sample.get('email_address', 'N/A')}")
+    return results
+
+
+async def example_company_search():
+    """Search for companies in a specific city."""
+    print("🏢 Example: company search")
+    results = await universal_scraper.search_and_scrape(_COMPANY_REQUEST)
+    print(f"   Found {results['total_results']} results")
+    if results["results"]:
+        sample = results["results"][0]
+        print(f"   Sample: {sample.get('name', 'N/A')}")
+    return results
+
+
+async def run_all_examples():
+    """Run every demo sequentially and write demo_summary.json."""
+    examples = [
+        example_product_search,
+        example_contact_search,
+        example_company_search,
+    ]
+
+    # One session scope across all examples: the connector, DNS cache and
+    # keep-alive connections are shared instead of rebuilt per demo.
+    all_results = []
+    async with universal_scraper.session_scope():
+        for example_func in examples:
+            try:
+                result = await example_func()
+                all_results.append(result)
+            except Exception as exc:
+                print(f"❌ {example_func.__name__} failed: {exc}")
+                all_results.append(None)
+            print("-" * 50)
+
+    successful = sum(1 for r in all_results if r is not None)
+    print(f"✅ Successful examples: {successful}/{len(examples)}")
+
+    # orjson emits UTF-8 bytes directly, so skip the text-mode wrapper.
+    with open("demo_summary.json", "wb") as f:
+        f.write(orjson.dumps(all_results, option=orjson.OPT_INDENT_2, default=str))
+    print("📄 Summary written to demo_summary.json")
+    return all_results
+
+
+if __name__ == "__main__":
+    try:
+        import uvloop
+    except ImportError:  # uvloop is unavailable on Windows
+        asyncio.run(run_all_examples())
+    else:
+        uvloop.run(run_all_examples())
@@ -0,0 +1,651 @@
+"""Ready-made extraction templates for common crawl targets.
+
+The library ships three worked templates (a UK contact page, an oak table
+product page and Vilnius IT company pages) plus helpers for building
+custom contact/product templates from a field wish-list.
+
+Templates are described by a static spec table (``_TEMPLATE_SPECS``) and
+materialized lazily into shared :class:`ExtractionTemplate` singletons;
+the public accessors are plain registry lookups.
+"""
+
+import functools
+import hashlib
+import inspect
+import pickle
+import re
+import sys
+import types
+from pathlib import Path
+from typing import Optional
+
+import regex
+
+try:
+    import re2
+except ImportError:  # RE2 is optional; the backtracking engines still work
+    re2 = None
+
+# Syntax RE2 cannot parse (possessive quantifiers, atomic groups); such
+# patterns go straight to the backtracking engine without the stderr noise
+# re2.compile emits on rejection.
+_RE2_UNSUPPORTED = ("?+", "*+", "++", "}+", "(?>")
+
+from field_selector import ExtractionTemplate, FieldSelector, FieldType
+
+
+def _compile_patterns(patterns, flags=re.IGNORECASE):
+    """Compile raw pattern strings once, at template-construction time.
+
+    Patterns compile on Google RE2 (linear-time DFA) when available and the
+    pattern is RE2-safe; otherwise on the third-party ``regex`` engine,
+    whose possessive quantifiers (``?+``/``++``) keep near-miss matching
+    linear. Both engines expose the same ``search``/``findall`` surface.
+    """
+    compiled = []
+    for pattern in patterns:
+        if not isinstance(pattern, str):
+            compiled.append(pattern)
+            continue
+        if re2 is not None and not any(tok in pattern for tok in _RE2_UNSUPPORTED):
+            prefix = "(?i)" if flags & re.IGNORECASE else ""
+            try:
+                compiled.append(re2.compile(prefix + pattern))
+                continue
+            except re2.error:
+                pass
+        compiled.append(regex.compile(pattern, flags))
+    return tuple(compiled)
+
+
+# ---------------------------------------------------------------------------
+# Shared selector/pattern groups referenced by multiple template specs.
+# ---------------------------------------------------------------------------
+
+# Selector lists are deduplicated and ordered by selectivity (prefixed
+# attribute selectors first, then classes, then tags) so the most precise
+# match wins early; structurally dominated selectors like .contact-phone
+# (covered by the .contact fallback) are pruned.
+_PHONE_CSS = (
+    "a[href^='tel:']",
+    "[data-phone]",
+    ".phone",
+    ".telephone",
+    ".phone-number",
+    ".mobile",
+)
+
+_EMAIL_CSS = ("a[href^='mailto:']", "[data-email]", ".email", ".email-address")
+
+_PHONE_INTL_RE = r"(?:\+\d{1,3})?+[\s-]?+(?:\d[\s-]?+){7,14}+"
+
+# The inner character runs are possessive so email scanning stays linear
+# on hostile text (long dotted runs, repeated '@'), but the outer label
+# loop must stay backtrackable: a fully possessive `(?>label\.)++`
+# swallows a sentence-ending dot after the TLD ("info@x.com. Call us")
+# and can never give it back, so the match fails outright.
+_EMAIL_RE = r"(?>[A-Za-z0-9._%+\-]++)@(?:[A-Za-z0-9\-]++\.)+[A-Za-z]{2,}"
+
+_ADDRESS_CSS = (".address", ".location", "address", "[itemprop='address']")
+
+_CONTACT_FALLBACK_CSS = (".contact", ".contact-info")
+
+# Unbounded [^,]+ / [\d,]+ runs are capped so a delimiter-free (minified)
+# page stays a bounded linear scan.
+_CURRENCY_RE = r"([€£$¥₹])\s?+([\d,]{1,10}\.?+\d{0,4})\b"
+
+_DIMENSIONS_RE = r"\d++\s?+(?:x|×)\s?+\d++(?:\s?+(?:x|×)\s?+\d++)?+\s?+(?:cm|mm|m)"
+
+# Compiled tuples are shared structurally across templates so a compiled-
+# selector cache keyed on identity sees one entry, not one per template.
+_EMAIL_PATTERNS = _compile_patterns([_EMAIL_RE])
+
+_EMAIL_VALIDATION = regex.compile("^" + _EMAIL_RE + "$", regex.IGNORECASE)
+
+_LOCATION_PATTERNS = _compile_patterns([r"\bLocation[\s:]*([^,\n]{1,80})"])
+
+
+# ---------------------------------------------------------------------------
+# Template spec table: FieldSelector kwargs in a dense static form. The
+# imperative per-template builder methods collapse into registry lookups.
+# ---------------------------------------------------------------------------
+
+_TEMPLATE_SPECS = {
+    "john_doe_contacts": {
+        "description": "Phone/email/address extraction for UK contact pages",
+        "priority_fields": ("phone_number", "email_address"),
+        "validation_rules": {
+            "location_filter": ["lisburn", "belfast", "northern ireland", "uk"],
+        },
+        "fields": (
+            dict(
+                name="phone_number",
+                field_type=FieldType.PHONE,
+                css_selectors=_PHONE_CSS,
+                fallback_selectors=_CONTACT_FALLBACK_CSS + (".info",),
+                regex_patterns=_compile_patterns([
+                    # UK national format
+                    r"(?:\+44|0)[\s-]?+\d{2,4}[\s-]?+\d{3,4}[\s-]?+\d{3,4}",
+                    # Ireland
+                    r"(?:\+353|0)[\s-]?+\d{1,3}[\s-]?+\d{3,4}[\s-]?+\d{3,4}",
+                    # International fallback
+                    _PHONE_INTL_RE,
+                ]),
+                format_function="format_phone",
+                required=True,
+            ),
+            dict(
+                name="email_address",
+                field_type=FieldType.EMAIL,
+                css_selectors=_EMAIL_CSS,
+                fallback_selectors=_CONTACT_FALLBACK_CSS,
+                regex_patterns=_EMAIL_PATTERNS,
+                validation_pattern=_EMAIL_VALIDATION,
+                format_function="format_email",
+                required=True,
+            ),
+            dict(
+                name="name",
+                field_type=FieldType.PERSON_NAME,
+                css_selectors=("h1", ".name", ".business-name", ".title"),
+            ),
+            dict(
+                name="address",
+                field_type=FieldType.ADDRESS,
+                css_selectors=_ADDRESS_CSS,
+                format_function="format_address",
+            ),
+            dict(
+                name="location",
+                field_type=FieldType.LOCATION,
+                css_selectors=(".location", ".area", ".region"),
+                regex_patterns=_LOCATION_PATTERNS,
+                context_keywords=("lisburn", "belfast", "northern ireland"),
+            ),
+        ),
+    },
+    "oak_table_dimensions": {
+        "description": "Product data for solid oak dining tables",
+        "priority_fields": ("price", "dimensions"),
+        "validation_rules": {
+            "material_filter": ["oak", "solid wood"],
+            "location_filter": ["uk", "ireland", "united kingdom"],
+        },
+        "fields": (
+            dict(
+                name="price",
+                field_type=FieldType.PRICE,
+                css_selectors=(
+                    "[data-price]",
+                    ".price",
+                    ".product-price",
+                    ".price-current",
+                    ".cost",
+                    ".amount",
+                ),
+                regex_patterns=_compile_patterns([
+                    _CURRENCY_RE,
+                    r"\b([\d,]{1,10}\.?\d{0,4})\s?(EUR|GBP|USD)\b",
+                    r"\bPrice[\s:]*([€£$]?[\d,]{1,10}\.?\d{0,4})",
+                ]),
+                format_function="format_price",
+                required=True,
+            ),
+            dict(
+                name="dimensions",
+                field_type=FieldType.DIMENSIONS,
+                css_selectors=(".dimensions", ".size", ".specs", ".specifications"),
+                regex_patterns=_compile_patterns([
+                    _DIMENSIONS_RE,
+                    r"(?:W|H|L|D)[\s:]*\d+\s?(?:cm|mm|m)",
+                    r"\d+\s?(?:cm|mm|m)\s?(?:wide|long|high|deep)",
+                ]),
+                format_function="format_dimensions",
+                multiple_values=True,
+                required=True,
+            ),
+            dict(
+                name="material",
+                field_type=FieldType.TEXT,
+                css_selectors=(".material", ".wood-type", ".construction"),
+                context_keywords=("oak", "solid wood", "hardwood"),
+            ),
+            dict(
+                name="location_available",
+                field_type=FieldType.LOCATION,
+                css_selectors=(".delivery", ".shipping", ".availability"),
+                regex_patterns=_compile_patterns([
+                    r"(?:Available in|Ships to|Delivery to)[\s:]*([^,\n]{1,80})",
+                ]),
+            ),
+            dict(
+                name="reviews",
+                field_type=FieldType.RATING,
+                css_selectors=("[data-rating]", ".rating", ".stars", ".review-score"),
+                regex_patterns=_compile_patterns([
+                    r"(\d\.?\d?)\s?(?:/|out of)\s?5",
+                    r"(\d\.?\d?)\s?stars?",
+                ]),
+                format_function="format_rating",
+            ),
+            dict(
+                name="price_range",
+                field_type=FieldType.PRICE,
+                css_selectors=(".price-range",),
+                regex_patterns=_compile_patterns([
+                    r"(?:From|Starting at)[\s:]*([€£$][\d,]{1,10})",
+                ]),
+            ),
+        ),
+    },
+    "vilnius_it_companies": {
+        "description": "IT company data with WordPress specialization signals",
+        "priority_fields": ("company_name", "email_address"),
+        "validation_rules": {
+            "location_filter": ["vilnius", "lithuania"],
+        },
+        "fields": (
+            dict(
+                name="company_name",
+                field_type=FieldType.COMPANY_NAME,
+                css_selectors=("h1", ".company-name", ".brand", ".logo-text"),
+                required=True,
+            ),
+            dict(
+                name="email_address",
+                field_type=FieldType.EMAIL,
+                css_selectors=_EMAIL_CSS,
+                regex_patterns=_EMAIL_PATTERNS,
+                format_function="format_email",
+                required=True,
+            ),
+            dict(
+                name="phone_number",
+                field_type=FieldType.PHONE,
+                css_selectors=_PHONE_CSS,
+                regex_patterns=_compile_patterns([
+                    # Lithuania
+                    r"(?:\+370|8)[\s-]?+\d{3}[\s-]?+\d{2}[\s-]?+\d{3}",
+                    _PHONE_INTL_RE,
+                ]),
+                format_function="format_phone",
+            ),
+            dict(
+                name="wordpress_specialization",
+                field_type=FieldType.TEXT,
+                css_selectors=(".services", ".specialization", ".skills"),
+                regex_patterns=_compile_patterns([r"(\bWordPress[^,.\n]{0,60})"]),
+                context_keywords=("wordpress", "woocommerce", "cms"),
+            ),
+            dict(
+                name="location",
+                field_type=FieldType.LOCATION,
+                css_selectors=(".location", ".address", ".office"),
+                regex_patterns=_LOCATION_PATTERNS,
+                context_keywords=("vilnius", "lithuania"),
+            ),
+        ),
+    },
+}
+
+
+def _build_template(name: str) -> ExtractionTemplate:
+    spec = _TEMPLATE_SPECS[name]
+    return ExtractionTemplate(
+        name=name,
+        description=spec["description"],
+        fields=tuple(FieldSelector(**kwargs) for kwargs in spec["fields"]),
+        priority_fields=spec["priority_fields"],
+        validation_rules=spec["validation_rules"],
+    )
+
+
+# Templates materialize lazily: building one compiles its regexes, CSS
+# selectors, automatons and Hyperscan database, so a process that only
+# ever uses one template shouldn't pay for the other two at import.
+_TEMPLATE_REGISTRY: dict[str, ExtractionTemplate] = {}
+
+
+# ---------------------------------------------------------------------------
+# Disk cache for built templates. Pattern compilation dominates template
+# construction cost, so built templates are persisted under
+# ~/.cache/crawler keyed by a hash of this module and field_selector's
+# source — editing either invalidates the cache by changing its filename.
+# Only picklable state is serialized (compiled regex/RE2 patterns and the
+# fused alternation); lxml selectors, automatons and the Hyperscan DB hold
+# C handles and are rebuilt by __post_init__ when the cache is thawed.
+# ---------------------------------------------------------------------------
+
+_CACHE_DIR = Path.home() / ".cache" / "crawler"
+
+# FieldSelector constructor kwargs that survive a pickle round-trip.
+_PICKLED_SELECTOR_FIELDS = (
+    "name",
+    "field_type",
+    "css_selectors",
+    "fallback_selectors",
+    "regex_patterns",
+    "validation_pattern",
+    "extraction_strategy",
+    "attribute_name",
+    "multiple_values",
+    "required",
+    "context_keywords",
+    "format_function",
+    "combined_pattern",
+)
+
+
+@functools.cache
+def _cache_path() -> Optional[Path]:
+    """Versioned cache file path, or None when sources are unavailable."""
+    import field_selector
+
+    try:
+        digest = hashlib.blake2b(digest_size=16)
+        for module in (sys.modules[__name__], field_selector):
+            digest.update(inspect.getsource(module).encode())
+    except (OSError, TypeError):  # frozen app / zipimport: no source text
+        return None
+    return _CACHE_DIR / f"templates-{digest.hexdigest()}.pkl"
+
+
+def _freeze_template(template: ExtractionTemplate) -> dict:
+    return {
+        "name": template.name,
+        "description": template.description,
+        "fields": tuple(
+            {attr: getattr(selector, attr) for attr in _PICKLED_SELECTOR_FIELDS}
+            for selector in template.fields
+        ),
+        "priority_fields": template.priority_fields,
+        "validation_rules": dict(template.validation_rules),
+    }
+
+
+def _thaw_template(frozen: dict) -> ExtractionTemplate:
+    return ExtractionTemplate(
+        name=frozen["name"],
+        description=frozen["description"],
+        fields=tuple(FieldSelector(**kwargs) for kwargs in frozen["fields"]),
+        priority_fields=frozen["priority_fields"],
+        validation_rules=frozen["validation_rules"],
+    )
+
+
+def _load_cached_templates() -> dict[str, ExtractionTemplate]:
+    path = _cache_path()
+    if path is None:
+        return {}
+    try:
+        with open(path, "rb") as f:
+            frozen = pickle.load(f)
+        return {name: _thaw_template(spec) for name, spec in frozen.items()}
+    except Exception:  # corrupt or stale cache: fall back to a live build
+        return {}
+
+
+def _store_cached_templates(registry: dict[str, ExtractionTemplate]) -> None:
+    path = _cache_path()
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(
+                {name: _freeze_template(t) for name, t in registry.items()},
+                f,
+                pickle.HIGHEST_PROTOCOL,
+            )
+        tmp.replace(path)  # atomic publish; readers never see a partial file
+    except (OSError, pickle.PickleError):
+        pass
+
+
+# Immutable, allocation-free view served by list_available_templates().
+_AVAILABLE_TEMPLATES = tuple(
+    types.MappingProxyType(
+        {
+            "name": name,
+            "description": spec["description"],
+            "priority_fields": spec["priority_fields"],
+        }
+    )
+    for name, spec in _TEMPLATE_SPECS.items()
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_extractor(name: str):
+    """Generate a straight-line text extractor for one template.
+
+    Emits (via ``exec``) a function whose body is one ``search`` +
+    conditional store per field, with the compiled pattern objects bound
+    as default arguments — no per-page loop over selector objects, no
+    attribute chasing in the hot path. Fields already present in the
+    optional seed dict (e.g. from a Hyperscan prefill) are skipped.
+    Returns None for unknown names.
+    """
+    template = _get_template(name)
+    if template is None:
+        return None
+    namespace = {}
+    params, body = [], []
+    for index, selector in enumerate(template.fields):
+        pattern = selector.combined_pattern
+        if pattern is None and selector.regex_patterns:
+            pattern = selector.regex_patterns[0]
+        if pattern is None:
+            continue
+        namespace[f"_p{index}"] = pattern
+        params.append(f"_p{index}=_p{index}")
+        body.append(f"    if {selector.name!r} not in result:")
+        body.append(f"        m = _p{index}.search(text)")
+        body.append("        if m is not None:")
+        body.append(f"            result[{selector.name!r}] = m.group(0).strip()")
+    source = (
+        "def extract(text, result=None, {}):\n"
+        "    result = {{}} if result is None else result\n"
+        "{}\n"
+        "    return result"
+    ).format(", ".join(params), "\n".join(body))
+    exec(source, namespace)  # noqa: S102 - source is built from our own specs
+    return namespace["extract"]
+
+
+def _hyperscan_prefill(template: ExtractionTemplate, text: str) -> dict:
+    """Resolve as many fields as possible in one Hyperscan scan.
+
+    All of the template's (Hyperscan-compilable) patterns are matched in
+    a single vectorized pass over the page; for each field the hit with
+    the highest-priority pattern (lowest pattern index), leftmost on
+    ties, wins. Fields whose patterns were dropped at DB build time are
+    left for the regex extractor.
+    """
+    if template.hs_db is None:
+        return {}
+    data = text.encode("utf-8", "replace")
+    ids = template.hs_pattern_ids
+    best: dict[int, tuple[int, int, int]] = {}
+
+    def on_match(match_id, start, end, flags, context):
+        field_index, pattern_index = ids[match_id]
+        current = best.get(field_index)
+        if current is None or (pattern_index, start) < current[:2]:
+            best[field_index] = (pattern_index, start, end)
+
+    template.hs_db.scan(data, match_event_handler=on_match)
+    return {
+        template.fields[field_index].name: data[start:end].decode("utf-8", "replace").strip()
+        for field_index, (_, start, end) in best.items()
+    }
+
+
+def _get_template(name: str) -> Optional[ExtractionTemplate]:
+    template = _TEMPLATE_REGISTRY.get(name)
+    if template is None and name in _TEMPLATE_SPECS:
+        if not _TEMPLATE_REGISTRY:
+            _TEMPLATE_REGISTRY.update(_load_cached_templates())
+            template = _TEMPLATE_REGISTRY.get(name)
+        if template is None:
+            template = _TEMPLATE_REGISTRY[name] = _build_template(name)
+            _store_cached_templates(_TEMPLATE_REGISTRY)
+    return template
+
+
+class TemplateLibrary:
+    """Accessors for the built-in extraction templates."""
+
+    @staticmethod
+    def get_john_doe_contact_template() -> ExtractionTemplate:
+        """Contact details for a UK/Northern-Ireland trades business."""
+        return _get_template("john_doe_contacts")
+
+    @staticmethod
+    def get_oak_table_template() -> ExtractionTemplate:
+        """Price/dimension extraction for solid oak table product pages."""
+        return _get_template("oak_table_dimensions")
+
+    @staticmethod
+    def get_vilnius_it_company_template() -> ExtractionTemplate:
+        """Company/contact extraction for Vilnius IT service companies."""
+        return _get_template("vilnius_it_companies")
+
+    @staticmethod
+    def get_template_by_name(template_name: str) -> Optional[ExtractionTemplate]:
+        """Look up a built-in template by its registry name.
+
+        Templates are shared singletons; callers that need to mutate one
+        should copy it first.
+        """
+        return _get_template(template_name)
+
+    @staticmethod
+    def compile(template_name: str):
+        """Return a specialized ``extract(text) -> dict`` for a template.
+
+        The extractor is generated once per template and cached; unknown
+        names return None so callers can fall back to generic patterns.
+        """
+        return _compile_extractor(template_name)
+
+    @staticmethod
+    def extract(template_name: str, text: str) -> Optional[dict]:
+        """Extract a named template's fields from ``text`` in one pass.
+
+        Runs the template's Hyperscan database first (one scan resolves
+        every supported pattern), then the specialized extractor fills
+        whatever Hyperscan couldn't cover. Returns None for unknown
+        template names.
+        """
+        extractor = _compile_extractor(template_name)
+        if extractor is None:
+            return None
+        template = _get_template(template_name)
+        return extractor(text, _hyperscan_prefill(template, text))
+
+    @staticmethod
+    def list_available_templates() -> tuple:
+        """Describe the built-in templates for UIs and CLIs.
+
+        Returns a cached tuple of read-only mappings; callers that need a
+        mutable copy can ``list(...)`` / ``dict(...)`` it.
+        """
+        return _AVAILABLE_TEMPLATES
+
+
+# Pre-built FieldSelector singletons for the custom-template helpers.
+# FieldSelector is frozen, so sharing one instance across every template
+# built from it is safe and avoids re-allocating selectors per call.
+_CONTACT_FIELDS = {
+    "phone": FieldSelector(
+        name="phone_number",
+        field_type=FieldType.PHONE,
+        css_selectors=(".phone", ".telephone", "a[href^='tel:']"),
+        regex_patterns=_compile_patterns([_PHONE_INTL_RE]),
+        format_function="format_phone",
+    ),
+    "email": FieldSelector(
+        name="email_address",
+        field_type=FieldType.EMAIL,
+        css_selectors=(".email", "a[href^='mailto:']"),
+        regex_patterns=_EMAIL_PATTERNS,
+        format_function="format_email",
+    ),
+    "address": FieldSelector(
+        name="address",
+        field_type=FieldType.ADDRESS,
+        css_selectors=(".address", "address", "[itemprop='address']"),
+        format_function="format_address",
+    ),
+}
+
+_PRODUCT_FIELDS = {
+    "price": FieldSelector(
+        name="price",
+        field_type=FieldType.PRICE,
+        css_selectors=(".price", ".product-price", "[data-price]"),
+        regex_patterns=_compile_patterns([_CURRENCY_RE]),
+        format_function="format_price",
+    ),
+    "dimensions": FieldSelector(
+        name="dimensions",
+        field_type=FieldType.DIMENSIONS,
+        css_selectors=(".dimensions", ".size", ".specs"),
+        regex_patterns=_compile_patterns([_DIMENSIONS_RE]),
+        format_function="format_dimensions",
+        multiple_values=True,
+    ),
+    "company": FieldSelector(
+        name="company_name",
+        field_type=FieldType.COMPANY_NAME,
+        css_selectors=("h1", ".company-name", ".brand"),
+    ),
+}
+
+
+def _template_from_blueprints(
+    name: str, description: str, blueprints: dict, required_fields: list[str]
+) -> ExtractionTemplate:
+    fields = tuple(
+        blueprints[key] for key in required_fields if key in blueprints
+    )
+    return ExtractionTemplate(
+        name=name,
+        description=description,
+        fields=fields,
+        priority_fields=tuple(selector.name for selector in fields),
+    )
+
+
+def create_contact_template(required_fields: list[str]) -> ExtractionTemplate:
+    """Build a custom contact template containing only the wanted fields."""
+    return _template_from_blueprints(
+        "custom_contact", "Custom contact extraction", _CONTACT_FIELDS, required_fields
+    )
+
+
+def create_product_template(required_fields: list[str]) -> ExtractionTemplate:
+    """Build a custom product template containing only the wanted fields."""
+    return _template_from_blueprints(
+        "custom_product", "Custom product extraction", _PRODUCT_FIELDS, required_fields
+    )
+
+
+if __name__ == "__main__":
+    # Test the templates
+    for info in TemplateLibrary.list_available_templates():
+        template = TemplateLibrary.get_template_by_name(info["name"])
+        print(f"{template.name}: {len(template.fields)} fields "
+              f"(priority: {', '.join(template.priority_fields)})")
+
+    # Regression: an email at the end of a sentence must still match.
+    # A fully possessive label loop once consumed the TLD plus the
+    # sentence-ending dot and could not backtrack, so this returned None.
+    result = TemplateLibrary.extract(
+        "john_doe_contacts", "email info@x.com. Call us"
+    )
+    assert result.get("email_address") == "info@x.com", result
+    assert regex.search(_EMAIL_RE, "@@@@") is None
+    print("email trailing-period regression: OK")
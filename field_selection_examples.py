@@ -0,0 +1,320 @@
+"""Worked examples for template-driven field selection.
+
+Each ``example_*`` coroutine pairs one of the built-in extraction
+templates (or a custom-built one) with a canned search request and prints
+the fields that came back. ``run_all_examples`` runs every demo; single
+demos can be picked from the command line by name.
+"""
+
+import asyncio
+import functools
+import io
+import sys
+
+# The scraper stack (aiohttp, pydantic, lxml, template compilation) is
+# imported inside the functions that need it, so running one example from
+# the CLI doesn't pay the full import bill of the others.
+
+# Caps how many scrape jobs run at once when the examples (and anything
+# importing them) fan out concurrently; per-request HTTP pacing is the
+# scraper's token bucket, this just bounds job-level parallelism.
+_SEM = asyncio.Semaphore(64)
+
+# Serializes the final write of each example's buffered output, so
+# concurrently running examples emit whole blocks instead of shredding
+# each other's lines.
+_PRINT_LOCK = asyncio.Lock()
+
+
+async def _flush_output(buf: "io.StringIO") -> None:
+    """Emit one example's buffered output atomically, in a single write."""
+    async with _PRINT_LOCK:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+# Fields each example displays, hoisted to static tuples: the display
+# loops iterate these few names and index into the sample, rather than
+# walking every extracted key against a per-iteration list literal.
+_JOHN_DOE_SHOW = ("phone_number", "email_address", "name", "location")
+_OAK_TABLE_SHOW = ("name", "price", "dimensions", "material")
+_VILNIUS_IT_SHOW = ("company_name", "email_address", "phone_number", "location")
+
+
+async def example_john_doe_search():
+    """Extract contact details for a named UK trades business."""
+    from universal_scraper import UniversalSearchRequest, universal_scraper
+
+    buf = io.StringIO()
+    print("📇 Example 1: John Doe contact extraction", file=buf)
+    request = UniversalSearchRequest(
+        search_query="John Doe carpentry Lisburn contact",
+        extraction_template="john_doe_contacts",
+        include_keywords=["carpentry", "joinery", "lisburn"],
+        countries=["United Kingdom"],
+        max_results=10,
+        output_formats=["json"],
+        output_prefix="john_doe_results",
+    )
+    async with _SEM:
+        results = await universal_scraper.search_and_scrape(request)
+    print(f"   Found {results['total_results']} results", file=buf)
+    if results["results"]:
+        sample = results["results"][0]
+        print("   Sample extracted fields:", file=buf)
+        for key in _JOHN_DOE_SHOW:
+            print(f"   - {key}: {sample.get(key, 'N/A')}", file=buf)
+    await _flush_output(buf)
+    return results
+
+
+async def example_oak_table_search():
+    """Extract price and dimensions for solid oak dining tables."""
+    from universal_scraper import UniversalSearchRequest, universal_scraper
+
+    buf = io.StringIO()
+    print("🪑 Example 2: oak table product extraction", file=buf)
+    request = UniversalSearchRequest(
+        search_query="solid oak dining table 200cm price",
+        extraction_template="oak_table_dimensions",
+        include_keywords=["oak", "solid wood", "table", "dining", "hardwood"],
+        exclude_keywords=["veneer", "laminate", "mdf", "particle board"],
+        max_results=10,
+        output_formats=["json", "csv"],
+        output_prefix="oak_table_results",
+    )
+    async with _SEM:
+        results = await universal_scraper.search_and_scrape(request)
+    print(f"   Found {results['total_results']} results", file=buf)
+    if results["results"]:
+        sample = results["results"][0]
+        print("   Sample extracted fields:", file=buf)
+        for key in _OAK_TABLE_SHOW:
+            print(f"   - {key}: {sample.get(key, 'N/A')}", file=buf)
+    await _flush_output(buf)
+    return results
+
+
+async def example_vilnius_it_search():
+    """Extract company and contact data for Vilnius IT companies."""
+    from universal_scraper import UniversalSearchRequest, universal_scraper
+
+    buf = io.StringIO()
+    print("🏢 Example 3: Vilnius IT company extraction", file=buf)
+    request = UniversalSearchRequest(
+        search_query="IT services company WordPress development Vilnius",
+        extraction_template="vilnius_it_companies",
+        include_keywords=["wordpress", "development", "it services"],
+        cities=["Vilnius"],
+        countries=["Lithuania"],
+        max_results=10,
+        output_formats=["json"],
+        output_prefix="vilnius_it_results",
+    )
+    async with _SEM:
+        results = await universal_scraper.search_and_scrape(request)
+    print(f"   Found {results['total_results']} results", file=buf)
+    if results["results"]:
+        sample = results["results"][0]
+        print("   Sample extracted fields:", file=buf)
+        for key in _VILNIUS_IT_SHOW:
+            print(f"   - {key}: {sample.get(key, 'N/A')}", file=buf)
+    await _flush_output(buf)
+    return results
+
+
+async def example_custom_field_extraction():
+    """Build a custom contact template and extract only its fields."""
+    from extraction_templates import create_contact_template
+    from universal_scraper import UniversalSearchRequest, universal_scraper
+
+    buf = io.StringIO()
+    print("🛠️ Example 4: custom field extraction", file=buf)
+    template = create_contact_template(["phone", "email", "address"])
+    print(f"   Custom template fields: {', '.join(f.name for f in template.fields)}", file=buf)
+    request = UniversalSearchRequest(
+        search_query="furniture workshop Belfast contact details",
+        custom_fields=["phone_number", "email_address", "address"],
+        countries=["United Kingdom"],
+        max_results=10,
+        output_formats=["json"],
+        output_prefix="custom_contact_results",
+    )
+    async with _SEM:
+        results = await universal_scraper.search_and_scrape(request)
+    print(f"   Found {results['total_results']} results", file=buf)
+    if results["results"]:
+        sample = results["results"][0]
+        # Project the shown fields once and emit a single write instead
+        # of one lookup + print per field.
+        projected = {k: sample.get(k, "N/A") for k in request.custom_fields}
+        print("   Sample extracted fields:", file=buf)
+        print("\n".join(f"   - {k}: {v}" for k, v in projected.items()), file=buf)
+    await _flush_output(buf)
+    return results
+
+
+async def example_hybrid_extraction():
+    """Combine a built-in template with extra custom fields."""
+    from extraction_templates import TemplateLibrary
+    from universal_scraper import UniversalSearchRequest, universal_scraper
+
+    buf = io.StringIO()
+    print("🔀 Example 5: hybrid template + custom fields", file=buf)
+    template = TemplateLibrary.get_oak_table_template()
+    request = UniversalSearchRequest(
+        search_query="oak table dimensions delivery reviews",
+        extraction_template=template.name,
+        custom_fields=["price", "dimensions", "material"],
+        include_keywords=["oak", "table"],
+        exclude_keywords=["veneer", "laminate"],
+        max_results=10,
+        output_formats=["json", "csv", "excel"],
+        output_prefix="hybrid_results",
+    )
+    async with _SEM:
+        results = await universal_scraper.search_and_scrape(request)
+    print(f"   Found {results['total_results']} results", file=buf)
+    if results["results"]:
+        sample = results["results"][0]
+        # One deduplicated projection over template + custom fields,
+        # printed in a single write.
+        shown = dict.fromkeys((*template.priority_fields, *request.custom_fields))
+        projected = {k: sample.get(k, "N/A") for k in shown}
+        print("   Template + custom fields:", file=buf)
+        print("\n".join(f"   - {k}: {v}" for k, v in projected.items()), file=buf)
+    await _flush_output(buf)
+    return results
+
+
+def show_available_templates():
+    """Print the built-in templates and their priority fields."""
+    from extraction_templates import TemplateLibrary
+
+    print("📋 Available extraction templates:")
+    for info in TemplateLibrary.list_available_templates():
+        print(f" - {info['name']}: {info['description']}")
+        print(f"   priority fields: {', '.join(info['priority_fields'])}")
+
+
+@functools.lru_cache(maxsize=1)
+def _field_type_listing() -> tuple[tuple[str, str], ...]:
+    """Enumerate FieldType once per process, in declaration order.
+
+    Kept behind lru_cache rather than computed at import so the lazy
+    field_selector import survives; repeat calls (server/CLI loops) reuse
+    the frozen tuple.
+    """
+    from field_selector import FieldType
+
+    field_descriptions = {
+        FieldType.PHONE: "telephone numbers, national or international format",
+        FieldType.EMAIL: "email addresses",
+        FieldType.ADDRESS: "street/postal addresses",
+        FieldType.PRICE: "prices with currency symbol or code",
+        FieldType.DIMENSIONS: "physical dimensions (WxHxD, cm/mm/m)",
+        FieldType.COMPANY_NAME: "company or brand names",
+        FieldType.PERSON_NAME: "personal names",
+        FieldType.LOCATION: "cities, regions, service areas",
+        FieldType.URL: "hyperlinks",
+        FieldType.RATING: "review scores and star ratings",
+        FieldType.TEXT: "free-form text snippets",
+        FieldType.CUSTOM: "caller-defined extraction",
+    }
+    return tuple(
+        (field_type.value, field_descriptions.get(field_type, ""))
+        for field_type in FieldType
+    )
+
+
+def show_field_types():
+    """Print the supported field types with a short description."""
+    print("🔤 Supported field types:")
+    for value, description in _field_type_listing():
+        print(f" - {value}: {description}")
+
+
+async def run_all_examples():
+    """Run every demo concurrently and report a success count."""
+    from universal_scraper import universal_scraper
+
+    show_available_templates()
+    print("-" * 50)
+    show_field_types()
+    print("-" * 50)
+
+    examples = (
+        example_john_doe_search,
+        example_oak_table_search,
+        example_vilnius_it_search,
+        example_custom_field_extraction,
+        example_hybrid_extraction,
+    )
+
+    # The examples are independent network-bound jobs, so schedule them
+    # together: wall time becomes roughly the slowest example instead of
+    # the sum of all five. as_completed hands back each example as it
+    # finishes, so output streams in completion order instead of stalling
+    # until the slowest one is done. The shared session scope means all
+    # five reuse one connector (keep-alive, cached DNS) instead of
+    # handshaking per example.
+    async with universal_scraper.session_scope():
+        await universal_scraper.warm_dns()
+        tasks = [
+            asyncio.create_task(example_func(), name=example_func.__name__)
+            for example_func in examples
+        ]
+        for future in asyncio.as_completed(tasks):
+            try:
+                await future
+            except Exception:
+                pass  # attributed below via the ordered task list
+            print("-" * 50)
+
+    all_results = []
+    for example_func, task in zip(examples, tasks):
+        exc = task.exception()
+        if exc is not None:
+            print(f"❌ {example_func.__name__} failed: {exc}")
+            all_results.append(None)
+        else:
+            all_results.append(task.result())
+
+    successful = sum(1 for r in all_results if r is not None)
+    print(f"✅ Successful examples: {successful}/{len(examples)}")
+    return all_results
+
+
+# CLI name -> attribute, resolved lazily at dispatch time so only the
+# chosen example's dependency chain is imported.
+examples_map = {
+    "john_doe": "example_john_doe_search",
+    "oak_table": "example_oak_table_search",
+    "vilnius_it": "example_vilnius_it_search",
+    "custom": "example_custom_field_extraction",
+    "hybrid": "example_hybrid_extraction",
+    "templates": "show_available_templates",
+    "field_types": "show_field_types",
+    "all": "run_all_examples",
+}
+
+
+if __name__ == "__main__":
+    import importlib
+    import sys
+
+    choice = sys.argv[1] if len(sys.argv) > 1 else "all"
+    target = examples_map.get(choice)
+    if target is None:
+        print(f"Unknown example {choice!r}. Choose from: {', '.join(examples_map)}")
+        sys.exit(1)
+    selected = getattr(importlib.import_module(__name__), target)
+    if asyncio.iscoroutinefunction(selected):
+        try:
+            import uvloop
+        except ImportError:  # uvloop is unavailable on Windows
+            asyncio.run(selected())
+        else:
+            uvloop.run(selected())
+    else:
+        selected()
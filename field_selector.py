@@ -0,0 +1,374 @@
+"""Field selection primitives for template-driven extraction.
+
+A :class:`FieldSelector` describes how to locate one logical field on a
+page (CSS selectors, regex patterns, formatting and validation hints); an
+:class:`ExtractionTemplate` bundles the selectors for one kind of target
+page. Templates are built either by hand (see ``extraction_templates``)
+or incrementally through :class:`TemplateBuilder`.
+"""
+
+import re
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import accumulate
+from typing import Optional, Union
+
+import regex
+
+try:
+    from lxml.cssselect import CSSSelector, SelectorError
+    from lxml.etree import XPath, XPathSyntaxError
+except ImportError:  # lxml is optional; BeautifulSoup paths still work
+    CSSSelector = None
+    SelectorError = Exception
+    XPath = None
+    XPathSyntaxError = Exception
+
+_XPATH_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_XPATH_LOWER = "abcdefghijklmnopqrstuvwxyz"
+
+try:
+    import ahocorasick
+except ImportError:  # keyword checks fall back to substring scans
+    ahocorasick = None
+
+try:
+    import soupsieve
+except ImportError:  # soup.select() re-parses selector strings instead
+    soupsieve = None
+
+try:
+    import hyperscan
+except ImportError:  # multi-pattern scanning falls back to per-field regexes
+    hyperscan = None
+
+
+def _build_hs_database(fields):
+    """Compile all field regexes of a template into one Hyperscan database.
+
+    Returns ``(db, id_map)`` where ``id_map[match_id]`` is the
+    ``(field_index, pattern_index)`` a reported match belongs to, letting
+    the extractor resolve every field in a single vectorized scan of the
+    page text. Patterns Hyperscan cannot compile (possessive/atomic
+    syntax) are dropped from the database and stay on the per-field path.
+
+    Expected casualties: the possessive phone/email patterns in the
+    contact templates (john_doe_contacts, vilnius_it_companies), plus
+    their bounded-capture location patterns, which blow Hyperscan's
+    per-pattern size limit under HS_FLAG_SOM_LEFTMOST — both templates
+    currently compile no database at all and run entirely on the
+    per-field regex path; only oak_table_dimensions gets a DB.
+    """
+    if hyperscan is None:
+        return None, ()
+    flags = (
+        hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_SOM_LEFTMOST
+        | hyperscan.HS_FLAG_UTF8
+    )
+    expressions, ids, id_map = [], [], []
+    for field_index, selector in enumerate(fields):
+        for pattern_index, pattern in enumerate(selector.regex_patterns):
+            source = getattr(pattern, "pattern", pattern)
+            expressions.append(source.encode("utf-8"))
+            ids.append(len(id_map))
+            id_map.append((field_index, pattern_index))
+    if not expressions:
+        return None, ()
+
+    def _try_compile(exprs, expr_ids):
+        db = hyperscan.Database()
+        db.compile(expressions=exprs, ids=expr_ids, flags=[flags] * len(exprs))
+        return db
+
+    try:
+        return _try_compile(expressions, ids), tuple(id_map)
+    except hyperscan.error:
+        supported = []
+        for expression, match_id in zip(expressions, ids):
+            try:
+                _try_compile([expression], [match_id])
+            except hyperscan.error:
+                continue
+            supported.append((expression, match_id))
+        if not supported:
+            return None, tuple(id_map)
+        exprs, expr_ids = zip(*supported)
+        return _try_compile(list(exprs), list(expr_ids)), tuple(id_map)
+
+
+def _build_automaton(keywords):
+    """Build an Aho-Corasick automaton over lowercased keywords.
+
+    One linear pass over element text then replaces a substring scan per
+    keyword. Returns None when pyahocorasick isn't installed.
+    """
+    if ahocorasick is None or not keywords:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        keyword = keyword.lower()
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+class FieldType(Enum):
+    """Logical kind of data a selector extracts."""
+
+    PHONE = "phone"
+    EMAIL = "email"
+    ADDRESS = "address"
+    PRICE = "price"
+    DIMENSIONS = "dimensions"
+    COMPANY_NAME = "company_name"
+    PERSON_NAME = "person_name"
+    LOCATION = "location"
+    URL = "url"
+    RATING = "rating"
+    TEXT = "text"
+    CUSTOM = "custom"
+
+
+class ExtractionStrategy(Enum):
+    """How the value is pulled out of a matched element."""
+
+    TEXT_CONTENT = "text_content"
+    ATTRIBUTE = "attribute"
+    HREF = "href"
+    REGEX = "regex"
+
+
+def _compile_soupsieve(selectors) -> tuple:
+    """Compile selectors to soupsieve matchers, None for rejects."""
+    compiled = []
+    for selector in selectors:
+        try:
+            compiled.append(soupsieve.compile(selector))
+        except soupsieve.SelectorSyntaxError:
+            compiled.append(None)
+    return tuple(compiled)
+
+
+@dataclass(slots=True, frozen=True)
+class FieldSelector:
+    """Everything needed to extract one field from a page.
+
+    Instances are frozen and use slots: container fields are tuples so
+    selectors can be shared safely across templates and cached by
+    identity. ``regex_patterns`` and ``validation_pattern`` accept either
+    raw pattern strings or precompiled ``re.Pattern`` objects.
+    """
+
+    name: str
+    field_type: FieldType
+    css_selectors: tuple[str, ...] = ()
+    fallback_selectors: tuple[str, ...] = ()
+    regex_patterns: tuple[Union[str, re.Pattern], ...] = ()
+    validation_pattern: Optional[Union[str, re.Pattern]] = None
+    extraction_strategy: ExtractionStrategy = ExtractionStrategy.TEXT_CONTENT
+    attribute_name: Optional[str] = None
+    multiple_values: bool = False
+    required: bool = False
+    context_keywords: tuple[str, ...] = ()
+    format_function: Optional[str] = None
+    combined_pattern: Optional[Union[re.Pattern, regex.Pattern]] = None
+    compiled_css: Optional["CSSSelector"] = None
+    compiled_fallback_css: Optional["CSSSelector"] = None
+    keyword_automaton: Optional[object] = None
+    compiled_xpath: Optional[object] = None
+    # Per-selector soupsieve matchers, aligned with css_selectors /
+    # fallback_selectors; None entries mark selectors soupsieve rejected.
+    compiled_sv: tuple = ()
+    compiled_fallback_sv: tuple = ()
+
+    def __post_init__(self):
+        # Keywords are stored pre-lowercased and interned so runtime
+        # checks compare against already-normalized, shared strings.
+        if self.context_keywords:
+            object.__setattr__(
+                self,
+                "context_keywords",
+                tuple(sys.intern(k.lower()) for k in self.context_keywords),
+            )
+        if self.keyword_automaton is None and self.context_keywords:
+            object.__setattr__(
+                self, "keyword_automaton", _build_automaton(self.context_keywords)
+            )
+        # Pre-compile each selector list into a single grouped CSSSelector
+        # so lxml-based extraction walks the tree once per field instead of
+        # once per selector. Falls back to per-selector mode on grouping
+        # failures (or when lxml isn't installed).
+        if CSSSelector is not None:
+            if self.compiled_css is None and self.css_selectors:
+                try:
+                    object.__setattr__(
+                        self,
+                        "compiled_css",
+                        CSSSelector(", ".join(self.css_selectors)),
+                    )
+                except SelectorError:
+                    pass
+            if self.compiled_fallback_css is None and self.fallback_selectors:
+                try:
+                    object.__setattr__(
+                        self,
+                        "compiled_fallback_css",
+                        CSSSelector(", ".join(self.fallback_selectors)),
+                    )
+                except SelectorError:
+                    pass
+        # Pre-compile soupsieve matchers so the BeautifulSoup path calls
+        # matcher.select(soup) at runtime instead of re-parsing the
+        # selector string on every page.
+        if soupsieve is not None:
+            if not self.compiled_sv and self.css_selectors:
+                object.__setattr__(
+                    self, "compiled_sv", _compile_soupsieve(self.css_selectors)
+                )
+            if not self.compiled_fallback_sv and self.fallback_selectors:
+                object.__setattr__(
+                    self,
+                    "compiled_fallback_sv",
+                    _compile_soupsieve(self.fallback_selectors),
+                )
+        # Translate the grouped selector to one compiled XPath, fusing the
+        # context-keyword filter into the expression so match + keyword
+        # check happen in a single C-level traversal on the lxml path.
+        if (
+            XPath is not None
+            and self.compiled_xpath is None
+            and self.compiled_css is not None
+        ):
+            path = self.compiled_css.path
+            if self.context_keywords:
+                conditions = " or ".join(
+                    "contains(translate(string(.), '%s', '%s'), '%s')"
+                    % (_XPATH_UPPER, _XPATH_LOWER, keyword.lower())
+                    for keyword in self.context_keywords
+                )
+                path = f"({path})[{conditions}]"
+            try:
+                object.__setattr__(self, "compiled_xpath", XPath(path))
+            except XPathSyntaxError:
+                pass
+        # Fuse multi-pattern fields into one named-group alternation so the
+        # extractor scans each element's text once; m.lastgroup ("g<i>")
+        # identifies which alternative fired, preserving priority order.
+        if (
+            self.combined_pattern is None
+            and len(self.regex_patterns) > 1
+            and not any(isinstance(p, str) for p in self.regex_patterns)
+        ):
+            object.__setattr__(
+                self,
+                "combined_pattern",
+                regex.compile(
+                    "|".join(
+                        f"(?P<g{i}>{p.pattern})"
+                        for i, p in enumerate(self.regex_patterns)
+                    ),
+                    regex.IGNORECASE,
+                ),
+            )
+
+
+@dataclass(slots=True, frozen=True)
+class ExtractionTemplate:
+    """A named bundle of field selectors for one kind of target page."""
+
+    name: str
+    description: str
+    fields: tuple[FieldSelector, ...] = ()
+    priority_fields: tuple[str, ...] = ()
+    validation_rules: dict = field(default_factory=dict)
+    filter_automaton: Optional[object] = None
+    hs_db: Optional[object] = None
+    hs_pattern_ids: tuple = ()
+    # Flat, integer-indexed view of the per-field patterns: a compiled
+    # matcher loop (or future C extension) can walk contiguous arrays
+    # instead of chasing attributes. field_pattern_offsets[i] is the end
+    # index of field i's slice in field_patterns_flat.
+    field_ids: tuple[int, ...] = ()
+    field_patterns_flat: tuple = ()
+    field_pattern_offsets: tuple[int, ...] = ()
+    # priority_fields as a frozenset, for per-page membership tests.
+    priority_set: frozenset[str] = frozenset()
+
+    def __post_init__(self):
+        # Normalize filter keyword lists to frozensets of interned
+        # lowercase strings (same invariant as context_keywords).
+        if self.validation_rules:
+            for key in ("location_filter", "material_filter"):
+                if key in self.validation_rules:
+                    self.validation_rules[key] = frozenset(
+                        sys.intern(kw.lower()) for kw in self.validation_rules[key]
+                    )
+        if self.priority_fields and not self.priority_set:
+            object.__setattr__(self, "priority_set", frozenset(self.priority_fields))
+        if self.fields and not self.field_ids:
+            object.__setattr__(self, "field_ids", tuple(range(len(self.fields))))
+            object.__setattr__(
+                self,
+                "field_patterns_flat",
+                tuple(p for f in self.fields for p in f.regex_patterns),
+            )
+            object.__setattr__(
+                self,
+                "field_pattern_offsets",
+                tuple(accumulate(len(f.regex_patterns) for f in self.fields)),
+            )
+        if self.hs_db is None and self.fields:
+            hs_db, hs_ids = _build_hs_database(self.fields)
+            object.__setattr__(self, "hs_db", hs_db)
+            object.__setattr__(self, "hs_pattern_ids", hs_ids)
+        # Union automaton over the location/material filter keywords so
+        # page-level validation is one scan regardless of list length.
+        if self.filter_automaton is None and self.validation_rules:
+            keywords = [
+                kw
+                for key in ("location_filter", "material_filter")
+                for kw in self.validation_rules.get(key, ())
+            ]
+            object.__setattr__(self, "filter_automaton", _build_automaton(keywords))
+
+
+class TemplateBuilder:
+    """Incrementally assemble an :class:`ExtractionTemplate`.
+
+    Fields accumulate in a plain list and are frozen into the immutable
+    template only at :meth:`build` time.
+    """
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._fields: list[FieldSelector] = []
+        self._priority_fields: tuple[str, ...] = ()
+        self._validation_rules: dict = {}
+
+    @property
+    def field_names(self) -> list[str]:
+        return [selector.name for selector in self._fields]
+
+    def add_field(self, selector: FieldSelector) -> "TemplateBuilder":
+        self._fields.append(selector)
+        return self
+
+    def set_priority_fields(self, names) -> "TemplateBuilder":
+        self._priority_fields = tuple(names)
+        return self
+
+    def set_validation_rules(self, rules: dict) -> "TemplateBuilder":
+        self._validation_rules = rules
+        return self
+
+    def build(self) -> ExtractionTemplate:
+        return ExtractionTemplate(
+            name=self.name,
+            description=self.description,
+            fields=tuple(self._fields),
+            priority_fields=self._priority_fields,
+            validation_rules=self._validation_rules,
+        )
@@ -0,0 +1,566 @@
+"""Google search scraping for furniture-market research.
+
+:class:`GoogleGeeking` collects organic result URLs for a query. The
+default path issues a direct HTTP request to the SERP endpoint and
+parses the anchors out of the response; a Selenium-driven Chrome session
+is kept behind ``use_browser=True`` for result pages that genuinely need
+JavaScript. Helpers below the class generate furniture query batches and
+run bulk searches.
+"""
+
+import asyncio
+import atexit
+import contextlib
+import functools
+import logging
+import mmap
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from urllib.parse import quote_plus, urlparse
+
+import httpx
+import orjson
+from aiolimiter import AsyncLimiter
+from selectolax.parser import HTMLParser
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:  # falls back to an exact (unbounded) set
+    ScalableBloomFilter = None
+
+logger = logging.getLogger(__name__)
+
+SEARCH_URL = "https://www.google.com/search"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Root domains never worth crawling, checked as an O(1) set lookup on the
+# registrable domain rather than a substring sweep over the netloc.
+_UNWANTED = frozenset(
+    {
+        "google.com",
+        "youtube.com",
+        "facebook.com",
+        "instagram.com",
+        "pinterest.com",
+        "twitter.com",
+        "linkedin.com",
+        "wikipedia.org",
+        "amazon.com",
+        "ebay.com",
+    }
+)
+
+# Compiled once; one alternation scan replaces ten per-keyword substring
+# passes over the lowercased URL.
+_FURN_RE = re.compile(
+    r"furniture|table|dining|oak|wood|chair|kitchen|home|interior|design",
+    re.IGNORECASE,
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse(url: str):
+    """Memoized urlparse — the same URLs recur across queries."""
+    return urlparse(url)
+
+
+@functools.lru_cache(maxsize=16384)
+def _norm_domain(url: str) -> str:
+    """Normalized host for a URL: lowercased, www. and port stripped.
+
+    The common ``scheme://host/...`` shape is sliced with str.split —
+    far cheaper than urlparse — with urlparse kept as the fallback for
+    anything odd. The cache collapses URLs repeated across overlapping
+    queries to one parse.
+    """
+    try:
+        host = url.split("/", 3)[2]
+        host = host.split("@")[-1].split(":")[0].lower()
+        return host[4:] if host.startswith("www.") else host
+    except (IndexError, AttributeError):
+        return urlparse(url).netloc.lower().removeprefix("www.")
+
+
+class GoogleGeeking:
+    """Scrapes organic Google result URLs for one query at a time."""
+
+    def __init__(self, headless: bool = True, max_results: int = 10, strict: bool = False):
+        self.headless = headless
+        self.max_results = max_results
+        self.user_agent = USER_AGENT
+        self.driver = None
+        # Seen-domain dedup. The Bloom filter keeps memory fixed on very
+        # long runs at a 1e-4 false-positive rate — occasionally skipping
+        # a fresh domain is acceptable for dedup. strict=True keeps an
+        # exact set for correctness-sensitive callers; both expose the
+        # same `in` / `.add` surface.
+        if strict or ScalableBloomFilter is None:
+            self.processed_domains = set()
+        else:
+            self.processed_domains = ScalableBloomFilter(
+                initial_capacity=10000, error_rate=1e-4
+            )
+        self._consent_handled = False
+        # Shared async HTTP client for the no-browser path; one client
+        # means TLS handshakes and HTTP/2 streams are amortized across
+        # every query issued inside the same event loop.
+        self._client = None
+
+    # ------------------------------------------------------------------
+    # HTTP path (default): no browser process, no page render.
+    # ------------------------------------------------------------------
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=15.0,
+                limits=httpx.Limits(max_connections=8),
+                headers={"User-Agent": self.user_agent},
+                follow_redirects=True,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (the driver has ``close()``)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+    async def _search_http(self, query: str) -> list:
+        """Fetch and parse the SERP directly over HTTP."""
+        client = self._get_client()
+        params = {"q": query, "num": self.max_results, "hl": "en"}
+        response = await client.get(SEARCH_URL, params=params)
+        response.raise_for_status()
+        return self._parse_serp(response.text)
+
+    def _parse_serp(self, html: str) -> list:
+        """Pull organic result hrefs out of SERP markup."""
+        tree = HTMLParser(html)
+        anchors = tree.css("div.yuRUbf > a")
+        if not anchors:
+            anchors = tree.css("a[jsname]")
+        urls = []
+        for anchor in anchors:
+            href = anchor.attributes.get("href")
+            if href and self._is_valid_url(href):
+                urls.append(href)
+            if len(urls) >= self.max_results:
+                break
+        return urls
+
+    # ------------------------------------------------------------------
+    # Selenium path, for pages that need a real browser.
+    # ------------------------------------------------------------------
+
+    def _setup_driver(self):
+        """Start a headless Chrome session tuned for scraping.
+
+        Eager page load returns control at DOMContentLoaded — the result
+        anchors exist well before images finish — and images, styles and
+        fonts are blocked outright since only the DOM matters here.
+        """
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument(f"--user-agent={self.user_agent}")
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option(
+            "prefs",
+            {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.stylesheets": 2,
+                "profile.managed_default_content_settings.fonts": 2,
+            },
+        )
+        self.driver = webdriver.Chrome(options=chrome_options)
+        # Explicit waits only: a global implicit wait would stack on top
+        # of every WebDriverWait below and inflate each miss.
+        self.driver.implicitly_wait(0)
+        self.driver.execute_cdp_cmd("Page.enable", {})
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd(
+            "Network.setBlockedURLs",
+            {
+                "urls": [
+                    "*.png",
+                    "*.jpg",
+                    "*.gif",
+                    "*.woff*",
+                    "*.css",
+                    "*/recaptcha/*",
+                    "*googletagmanager*",
+                ]
+            },
+        )
+
+    # All known accept-button selectors as one comma list, so a single
+    # wait matches whichever variant renders.
+    _CONSENT_SELECTOR = ", ".join(
+        (
+            "button#L2AGLb",
+            "button[aria-label='Accept all']",
+            "div[role='dialog'] button:nth-of-type(2)",
+            "form[action*='consent'] button",
+        )
+    )
+
+    def _handle_cookie_consent(self):
+        """Click through Google's consent dialog if it appears.
+
+        One short combined-selector wait covers every dialog variant: a
+        missing dialog costs at most 2s instead of four stacked probes.
+        """
+        try:
+            button = WebDriverWait(self.driver, 2, poll_frequency=0.2).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, self._CONSENT_SELECTOR))
+            )
+            button.click()
+        except TimeoutException:
+            pass  # no dialog shown
+
+    def _nav_fast(self, url: str, ready_selector: str = "#search", timeout: float = 3.0):
+        """Navigate via CDP and poll for a ready marker instead of driver.get.
+
+        ``Page.navigate`` returns immediately; a tight 50ms JS poll then
+        waits only until ``ready_selector`` exists, rather than blocking
+        on the page's full load cycle and its interstitials.
+        """
+        self.driver.execute_cdp_cmd("Page.navigate", {"url": url})
+        deadline = time.monotonic() + timeout
+        script = f"return !!document.querySelector({ready_selector!r})"
+        while time.monotonic() < deadline:
+            if self.driver.execute_script(script):
+                return True
+            time.sleep(0.05)
+        return False
+
+    def search(self, query: str, use_browser: bool = False) -> list:
+        """Search one query and return filtered organic result URLs.
+
+        The HTTP path is the default; ``use_browser=True`` drives the
+        Chrome session instead. The sync wrapper runs the HTTP search in
+        its own event loop and closes the client with it — async callers
+        should use :meth:`_search_http` directly on a shared loop.
+        """
+        if not use_browser:
+            async def _one():
+                try:
+                    return await self._search_http(query)
+                finally:
+                    await self.aclose()
+
+            return asyncio.run(_one())
+
+        if self.driver is None:
+            self._setup_driver()
+
+        # Navigate straight to the SERP URL: no homepage round trip, no
+        # search-box send_keys round trips.
+        self._nav_fast(
+            f"{SEARCH_URL}?q={quote_plus(query)}&num={self.max_results}&hl=en&gbv=1"
+        )
+        if not self._consent_handled:
+            self._handle_cookie_consent()
+            self._consent_handled = True
+
+        try:
+            WebDriverWait(self.driver, 5, poll_frequency=0.2).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "div.yuRUbf"))
+            )
+        except TimeoutException:
+            logger.warning("No results rendered for query: %s", query)
+            return []
+
+        # One in-page script pulls every href at once; a find_elements +
+        # per-element get_attribute loop pays a WebDriver round trip per
+        # result, this pays exactly one.
+        hrefs = self.driver.execute_script(
+            """
+            return Array.from(document.querySelectorAll('div.yuRUbf > a'))
+              .map(a => a.href);
+            """
+        )
+        urls = []
+        for href in hrefs:
+            if href and self._is_valid_url(href):
+                urls.append(href)
+            if len(urls) >= self.max_results:
+                break
+        return urls
+
+    def _is_valid_url(self, url: str) -> bool:
+        """Filter out search-engine chrome, junk domains and repeats."""
+        parsed = _parse(url)
+        if parsed.scheme not in ("http", "https"):
+            return False
+        domain = _norm_domain(url)
+        root = ".".join(domain.rsplit(".", 2)[-2:])
+        if root in _UNWANTED:
+            return False
+        if domain in self.processed_domains:
+            logger.debug("Skipping already processed domain: %s", domain)
+            return False
+        if not _FURN_RE.search(url):
+            return False
+        self.processed_domains.add(domain)
+        return True
+
+    async def search_many(self, queries: list, concurrency: int = 5) -> dict:
+        """Search many queries concurrently over the shared HTTP client.
+
+        Queries multiplex over one HTTP/2 connection pool; a semaphore
+        bounds how many are in flight and a token-bucket limiter paces
+        request starts (5 per 10s) instead of a fixed sleep, so idle
+        time is bounded by the rate limit rather than added to it.
+        """
+        sem = asyncio.Semaphore(concurrency)
+        limiter = AsyncLimiter(5, 10)
+
+        async def _one(query):
+            async with sem:
+                await limiter.acquire()
+                logger.info("Searching: %s", query)
+                return query, await self._search_http(query)
+
+        return dict(await asyncio.gather(*(_one(q) for q in queries)))
+
+    def search_multiple_queries(self, queries: list) -> dict:
+        """Sync wrapper around :meth:`search_many`."""
+        async def _run():
+            try:
+                return await self.search_many(queries)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(_run())
+
+    def get_unique_urls(self, all_urls) -> list:
+        """Collapse URLs to one per domain, preserving first-seen order.
+
+        Accepts any iterable, so callers can feed a generator without
+        materializing the combined URL list first.
+        """
+        domain_tracker = set()
+        unique_urls = []
+        for url in all_urls:
+            domain = _norm_domain(url)
+            if domain not in domain_tracker:
+                domain_tracker.add(domain)
+                unique_urls.append(url)
+        return unique_urls
+
+    def save_results(self, results: dict, filename: str = "search_results.json"):
+        """Persist search results as JSON.
+
+        orjson serializes straight to UTF-8 bytes (no intermediate
+        Python string), written in one call; output stays indented for
+        hand inspection.
+        """
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        logger.info("Results saved to %s", filename)
+
+    def load_results(self, filename: str = "search_results.json") -> dict:
+        """Load previously saved search results.
+
+        The file is memory-mapped and handed to orjson through a
+        zero-copy memoryview (orjson accepts bytes/bytearray/memoryview
+        but not mmap objects directly), so parsing avoids the extra
+        in-memory copy a read() would make — relevant once bulk result
+        files reach MBs. Empty files can't be mapped and hold nothing
+        anyway.
+        """
+        if not os.path.exists(filename):
+            return {}
+        with open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return {}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return orjson.loads(memoryview(mm))
+
+    def close(self):
+        """Quit the browser session if one was started."""
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+    def __enter__(self) -> "GoogleGeeking":
+        # The driver stays lazy: HTTP-only usage inside a with-block
+        # never pays for a browser launch.
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @classmethod
+    def get_shared(cls, headless: bool = True, max_results: int = 10) -> "GoogleGeeking":
+        """Return the process-wide shared instance, creating it lazily.
+
+        Browser startup dominates a single search, so one session is
+        reused for the life of the process and quit only at exit. The
+        first caller's settings win; later calls just update
+        ``max_results``.
+        """
+        global _shared_geeking
+        with _driver_lock:
+            if _shared_geeking is None:
+                _shared_geeking = cls(headless=headless, max_results=max_results)
+                atexit.register(_close_shared)
+            else:
+                _shared_geeking.max_results = max_results
+            return _shared_geeking
+
+
+_driver_lock = threading.Lock()
+_shared_geeking: Optional[GoogleGeeking] = None
+
+# Per-worker GoogleGeeking for GoogleGeekingPool: each pool process gets
+# its own browser session, since a Chrome driver can't be shared across
+# processes (or safely across threads).
+_worker_geeking: Optional[GoogleGeeking] = None
+
+
+def _init_worker(kwargs: dict):
+    """Pool initializer: create this process's GoogleGeeking and driver."""
+    global _worker_geeking
+    stack = contextlib.ExitStack()
+    _worker_geeking = stack.enter_context(GoogleGeeking(**kwargs))
+    _worker_geeking._setup_driver()
+    atexit.register(stack.close)
+
+
+def _do_search(query: str) -> tuple:
+    """Run one browser search on this process's session."""
+    return query, _worker_geeking.search(query, use_browser=True)
+
+
+class GoogleGeekingPool:
+    """Process pool of browser sessions for browser-required searches.
+
+    One Chrome session per worker process; queries fan out across them,
+    so bulk wall time shrinks roughly by the worker count until CPU or
+    RAM saturate.
+    """
+
+    def __init__(self, workers: int = 4, **kwargs):
+        self.ex = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(kwargs,)
+        )
+
+    def submit(self, query: str):
+        """Schedule one query; returns a future of (query, urls)."""
+        return self.ex.submit(_do_search, query)
+
+    def search_many(self, queries: list) -> dict:
+        """Search all queries across the pool and return {query: urls}."""
+        return dict(self.ex.map(_do_search, queries))
+
+    def close(self):
+        self.ex.shutdown(wait=True)
+
+
+def _close_shared():
+    """atexit hook: quit the shared browser session at process exit."""
+    global _shared_geeking
+    if _shared_geeking is not None:
+        _shared_geeking.close()
+        _shared_geeking = None
+
+
+# Query shapes applied to every base term; formatted in one list
+# comprehension rather than rebuilt f-string by f-string in nested loops.
+_PATTERNS_BASE = ("{t}", "{t} UK", "buy {t}", "{t} furniture store")
+
+_BASE_TERMS = (
+    "solid oak dining table",
+    "oak furniture",
+    "handmade wooden table",
+    "bespoke kitchen table",
+)
+
+_QUALIFIERS = (
+    "UK",
+    "Northern Ireland",
+    "near me",
+    "price",
+    "for sale",
+)
+
+
+def generate_furniture_queries(limit: Optional[int] = None) -> list:
+    """Build the standard batch of furniture-market search queries.
+
+    The base patterns expand in one list comprehension and the
+    qualifier combinations extend it with a generator, so CPython runs
+    the loops in C. Queries are deduplicated case-insensitively in
+    insertion order; ``limit`` caps the distinct count.
+    """
+    queries = [p.format(t=term) for term in _BASE_TERMS for p in _PATTERNS_BASE]
+    queries.extend(
+        f"{qualifier} {term}" for term in _BASE_TERMS for qualifier in _QUALIFIERS
+    )
+    seen: dict = {}
+    for query in queries:
+        seen.setdefault(query.lower(), query)
+        if limit is not None and len(seen) >= limit:
+            break
+    return list(seen.values())
+
+
+def quick_search(query: str, headless: bool = True, max_results: int = 10) -> list:
+    """One-shot convenience search on the shared session."""
+    return GoogleGeeking.get_shared(headless=headless, max_results=max_results).search(query)
+
+
+def bulk_furniture_search(headless: bool = True, restart_every: int = 0) -> dict:
+    """Run the generated furniture queries and save combined results.
+
+    The shared session is reused across the batch; pass a positive
+    ``restart_every`` to quit and relaunch the browser every N queries
+    on the Selenium path, bounding long-run memory growth.
+    """
+    geeking = GoogleGeeking.get_shared(headless=headless, max_results=10)
+    queries = generate_furniture_queries(limit=15)
+    if restart_every > 0:
+        results = {}
+        for i, query in enumerate(queries):
+            if i and i % restart_every == 0:
+                geeking.close()
+            results[query] = geeking.search(query)
+    else:
+        results = geeking.search_multiple_queries(queries)
+    unique_urls = geeking.get_unique_urls(
+        url for urls in results.values() for url in urls
+    )
+    combined = {
+        "queries": results,
+        "unique_urls": unique_urls,
+        "total_urls": len(unique_urls),
+    }
+    geeking.save_results(combined)
+    return combined
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    urls = quick_search("solid oak dining table UK")
+    for url in urls:
+        print(url)
@@ -0,0 +1,466 @@
+"""Furniture price crawler API.
+
+Exposes ``POST /crawl``: given a list of product-page URLs, fetches each
+page, extracts price, dimensions, delivery/service terms and contact
+details, converts prices to the requested base currency, and writes the
+combined table to CSV and Excel with Latvian column headers.
+
+Fetching is async — one shared aiohttp session fans out over the URL
+list — while parsing runs in a process pool, and each finished row is
+streamed straight to the CSV and Excel writers.
+"""
+
+import asyncio
+import csv
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import aiohttp
+import xlsxwriter
+from bs4 import BeautifulSoup
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="Furniture Price Crawler")
+
+RATES_URL = "https://api.exchangerate.host/latest?base=EUR"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+COLUMNS = [
+    "URL",
+    "Nosaukums",
+    "Cena_summa",
+    "Cena_valūta",
+    "Cena_EUR",
+    "Izmēri",
+    "Piegādes_cena",
+    "Piegādes_laiks",
+    "Atgriešana",
+    "Garantija",
+    "Izgatavošanas_laiks",
+    "Noliktavā",
+    "Apmaksa",
+    "E_pasts",
+    "Tālrunis",
+    "PVN",
+]
+
+# All price selectors as one comma-joined query: soupsieve walks the
+# tree once for the whole group instead of once per selector.
+PRICE_SELECTOR = ", ".join(
+    (
+        ".price",
+        ".product-price",
+        ".price-current",
+        "[data-price]",
+        ".cost",
+        ".amount",
+        ".value",
+        "[class*='price']",
+        "[id*='price']",
+    )
+)
+
+CURRENCY_MAP = {"€": "EUR", "£": "GBP", "$": "USD"}
+
+# Every extractor pattern compiled once at import: the extractors run
+# per URL and several times per page, and a compiled pattern's method
+# skips the re-cache lookup entirely.
+DIM_RES = tuple(
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"(\d+)\s*[x×]\s*(\d+)\s*[x×]\s*(\d+)\s*(cm|mm|m)",
+        r"(\d+)\s*[x×]\s*(\d+)\s*(cm|mm|m)",
+        r"garums[:\s]+(\d+)\s*(cm|mm|m)",
+        r"length[:\s]+(\d+)\s*(cm|mm|m)",
+        r"(\d+)\s*(cm|mm|m)\s+[x×]\s+(\d+)\s*(cm|mm|m)",
+    )
+)
+
+DELIVERY_COST_RE = re.compile(
+    r"(?:delivery|shipping|piegāde)[^.]{0,40}?([€£$]\s?[\d.,]+|free|bezmaksas)",
+    re.IGNORECASE,
+)
+DELIVERY_TIME_RE = re.compile(
+    r"(?:delivery|shipping|piegāde)[^.]{0,60}?(\d+\s*[-–]?\s*\d*\s*(?:days?|weeks?|dienas|nedēļas))",
+    re.IGNORECASE,
+)
+RETURN_RE = re.compile(
+    r"(\d+)\s*(?:day|diena|dienu)s?\s*(?:return|atgriešana)", re.IGNORECASE
+)
+WARRANTY_RE = re.compile(
+    r"(\d+)\s*(?:year|month|gada|mēneš)\w*\s*(?:warranty|guarantee|garantija)",
+    re.IGNORECASE,
+)
+CUSTOM_TIME_RE = re.compile(
+    r"(?:made to order|bespoke|pēc pasūtījuma)[^.]{0,50}?(\d+\s*[-–]?\s*\d*\s*(?:days?|weeks?|dienas|nedēļas))",
+    re.IGNORECASE,
+)
+
+EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+PHONE_RE = re.compile(r"(?:\+\d{1,3}|0)[\s-]?[\d\s-]{7,}")
+
+# One alternation sweep over the page text replaces four per-category
+# substring scans; the matched phrase maps back to its status label.
+STOCK_RE = re.compile(
+    r"in stock|available now|ready to ship"
+    r"|out of stock|sold out|unavailable"
+    r"|pre-order|coming soon|expected"
+    r"|made to order|bespoke"
+)
+STOCK_STATUS = {
+    "in stock": "In Stock",
+    "available now": "In Stock",
+    "ready to ship": "In Stock",
+    "out of stock": "Out of Stock",
+    "sold out": "Out of Stock",
+    "unavailable": "Out of Stock",
+    "pre-order": "Pre-order",
+    "coming soon": "Pre-order",
+    "expected": "Pre-order",
+    "made to order": "Made to Order",
+    "bespoke": "Made to Order",
+}
+
+PAYMENT_RE = re.compile(r"visa|mastercard|paypal|klarna|apple pay|bank transfer")
+
+
+class CrawlRequest(BaseModel):
+    urls: list[str]
+    base_currency: str = "EUR"
+    output_csv: str = "furniture_prices.csv"
+    output_excel: str = "furniture_prices.xlsx"
+
+
+# One session per process: the connector keeps per-host keep-alive
+# connections warm across the whole URL list, and the semaphore caps
+# how many fetches are in flight at once.
+_session: Optional[aiohttp.ClientSession] = None
+_fetch_sem = asyncio.Semaphore(32)
+
+# lxml parsing plus the regex sweeps are the CPU-bound half of a scrape;
+# in a thread executor they serialize on the GIL. A process pool lets
+# parsing fan out across cores while the event loop keeps fetching.
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _parse_pool
+
+
+def get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=64, limit_per_host=16, keepalive_timeout=30, ssl=False
+            ),
+            headers={
+                "User-Agent": USER_AGENT,
+                # Advertise brotli alongside gzip: smaller bodies mean
+                # fewer bytes for BeautifulSoup to chew through.
+                "Accept-Encoding": "gzip, deflate, br",
+            },
+        )
+    return _session
+
+
+# EUR-based FX rate table, refreshed in the background every 15 minutes
+# so per-row conversion is a pair of local dict lookups — no FX library,
+# no network call on the crawl path.
+_RATES_REFRESH = 900.0
+RATES: dict = {}
+
+
+async def _fetch_rates() -> None:
+    """Replace the module rate table with a fresh EUR-based one."""
+    global RATES
+    session = get_session()
+    async with session.get(
+        RATES_URL, timeout=aiohttp.ClientTimeout(total=10)
+    ) as response:
+        response.raise_for_status()
+        data = await response.json()
+    rates = dict(data.get("rates") or {})
+    rates.setdefault("EUR", 1.0)
+    # Rebinding the name swaps the table atomically for concurrent readers.
+    RATES = rates
+
+
+async def _rates_refresher() -> None:
+    """Startup task: keep RATES fresh on a fixed timer."""
+    while True:
+        try:
+            await _fetch_rates()
+        except Exception as e:
+            logger.warning("FX rate refresh failed: %s", e)
+        await asyncio.sleep(_RATES_REFRESH)
+
+
+_PRICE_NUMBER_CHARS = frozenset("0123456789., \xa0")
+
+
+def parse_price(price_text: str):
+    """Pull (value, currency) out of a price string like ``€1 299,00``.
+
+    A direct character scan over the short price string: find a
+    currency glyph, consume the digit run after it, normalize the
+    separators. No regex and no whole-string ``\\xa0`` rewrite — the
+    texts come from small price tags, where the scan beats the regex
+    machinery.
+    """
+    n = len(price_text)
+    start = 0
+    while start < n:
+        # Earliest currency glyph at or after `start`.
+        i = -1
+        symbol = ""
+        for ch in "€£$":
+            j = price_text.find(ch, start)
+            if j != -1 and (i == -1 or j < i):
+                i, symbol = j, ch
+        if i == -1:
+            return None, None
+        j = i + 1
+        while j < n and price_text[j] in " \xa0":
+            j += 1
+        k = j
+        while k < n and price_text[k] in _PRICE_NUMBER_CHARS:
+            k += 1
+        number = (
+            price_text[j:k].replace("\xa0", "").replace(" ", "").replace(",", ".")
+        )
+        # Keep only the last dot as the decimal separator.
+        if number.count(".") > 1:
+            whole, _, frac = number.rpartition(".")
+            number = whole.replace(".", "") + "." + frac
+        try:
+            return float(number), CURRENCY_MAP[symbol]
+        except ValueError:
+            # Glyph without a number after it — keep scanning, like the
+            # old regex search did.
+            start = i + 1
+    return None, None
+
+
+def extract_dimensions(text: str) -> str:
+    """Find WxDxH-style dimensions anywhere in the page text."""
+    for pattern in DIM_RES:
+        match = pattern.search(text)
+        if match:
+            return match.group(0)
+    return ""
+
+
+def extract_delivery_info(text: str) -> dict:
+    """Delivery cost and time from the lowercased page text."""
+    info = {"cost": "", "time": ""}
+    cost_match = DELIVERY_COST_RE.search(text)
+    if cost_match:
+        info["cost"] = cost_match.group(1)
+    time_match = DELIVERY_TIME_RE.search(text)
+    if time_match:
+        info["time"] = time_match.group(1)
+    return info
+
+
+def extract_service_info(text: str) -> dict:
+    """Returns policy, warranty and made-to-order lead time."""
+    info = {"returns": "", "warranty": "", "custom_time": ""}
+    return_match = RETURN_RE.search(text)
+    if return_match:
+        info["returns"] = return_match.group(0)
+    warranty_match = WARRANTY_RE.search(text)
+    if warranty_match:
+        info["warranty"] = warranty_match.group(0)
+    custom_match = CUSTOM_TIME_RE.search(text)
+    if custom_match:
+        info["custom_time"] = custom_match.group(1)
+    return info
+
+
+def extract_stock_status(text: str) -> str:
+    """Classify stock availability from lowercased page phrases.
+
+    One pass over the text; the first stock phrase encountered wins.
+    """
+    match = STOCK_RE.search(text)
+    return STOCK_STATUS[match.group(0)] if match else ""
+
+
+def extract_payment_info(text: str) -> str:
+    """Accepted payment methods mentioned on the page."""
+    return ", ".join(dict.fromkeys(PAYMENT_RE.findall(text)))
+
+
+def extract_contact_info(text: str) -> dict:
+    """First email address and phone number found in the page text."""
+    info = {"email": "", "phone": ""}
+    email_match = EMAIL_RE.search(text)
+    if email_match:
+        info["email"] = email_match.group(0)
+    phone_match = PHONE_RE.search(text)
+    if phone_match:
+        info["phone"] = phone_match.group(0).strip()
+    return info
+
+
+def parse_html(url: str, html: bytes) -> dict:
+    """CPU half of a scrape: parse the page and build one result row.
+
+    Takes the raw response bytes: lxml sniffs the encoding itself, so
+    no separate decode pass is needed before parsing.
+    """
+    soup = BeautifulSoup(html, "lxml")
+
+    title = ""
+    if soup.title and soup.title.string:
+        title = soup.title.string.strip()
+    h1 = soup.find("h1")
+    if h1:
+        title = h1.get_text(strip=True) or title
+
+    # One tree walk collects every candidate in document order; the
+    # first tag whose text parses as a price wins.
+    price_val, price_cur = None, None
+    for price_tag in soup.select(PRICE_SELECTOR):
+        price_val, price_cur = parse_price(price_tag.get_text())
+        if price_val is not None:
+            break
+
+    # One DOM walk and one lowercase copy feed every text extractor,
+    # instead of each doing its own full get_text()/lower() pass.
+    page_text = soup.get_text(" ", strip=True)
+    page_text_lower = page_text.lower()
+
+    delivery = extract_delivery_info(page_text_lower)
+    service = extract_service_info(page_text_lower)
+    contact = extract_contact_info(page_text)
+    has_pvn = "pvn" in page_text_lower
+
+    return {
+        "URL": url,
+        "Nosaukums": title,
+        "Cena_summa": price_val,
+        "Cena_valūta": price_cur,
+        "Cena_EUR": None,  # filled per row by crawl_tables via its factor map
+        "Izmēri": extract_dimensions(page_text),
+        "Piegādes_cena": delivery["cost"],
+        "Piegādes_laiks": delivery["time"],
+        "Atgriešana": service["returns"],
+        "Garantija": service["warranty"],
+        "Izgatavošanas_laiks": service["custom_time"],
+        "Noliktavā": extract_stock_status(page_text_lower),
+        "Apmaksa": extract_payment_info(page_text_lower),
+        "E_pasts": contact["email"],
+        "Tālrunis": contact["phone"],
+        "PVN": "Jā" if has_pvn else "Nē",
+    }
+
+
+async def scrape_table_data(url: str) -> dict:
+    """Fetch one product page and extract its result row."""
+    session = get_session()
+    async with _fetch_sem:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            response.raise_for_status()
+            html = await response.read()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_parse_pool(), parse_html, url, html
+    )
+
+
+@app.post("/crawl")
+async def crawl_tables(request: CrawlRequest):
+    """Crawl the given product URLs and export the combined price table."""
+    # The refresher normally keeps RATES warm; fetch inline only when a
+    # crawl lands before the first refresh has completed.
+    if not RATES:
+        try:
+            await _fetch_rates()
+        except Exception as e:
+            logger.warning("FX rate fetch failed: %s", e)
+    rates = RATES
+
+    # Factor from each currency into the base currency, built once per
+    # batch; per-row conversion is then a single multiply.
+    base_rate = rates.get(request.base_currency, 1.0)
+    factor_map = {cur: base_rate / rate for cur, rate in rates.items() if rate}
+
+    async def _one(url):
+        try:
+            return url, await scrape_table_data(url)
+        except Exception as e:
+            return url, e
+
+    # Both writers stream: csv.writer flushes rows as they come, and
+    # xlsxwriter's constant_memory mode spills finished rows to disk.
+    # Each completed scrape is written out immediately and dropped, so
+    # memory stays flat no matter how long the URL list is.
+    scraped = 0
+    failed = []
+    tasks = [asyncio.ensure_future(_one(url)) for url in request.urls]
+    with open(request.output_csv, "w", encoding="utf-8-sig", newline="") as f:
+        csv_writer = csv.writer(f)
+        csv_writer.writerow(COLUMNS)
+        workbook = xlsxwriter.Workbook(request.output_excel, {"constant_memory": True})
+        try:
+            worksheet = workbook.add_worksheet()
+            worksheet.write_row(0, 0, COLUMNS)
+            for future in asyncio.as_completed(tasks):
+                url, result = await future
+                if isinstance(result, Exception):
+                    logger.warning("Failed to scrape %s: %s", url, result)
+                    failed.append(url)
+                    continue
+                if result["Cena_summa"] is not None:
+                    factor = factor_map.get(result["Cena_valūta"], 1.0)
+                    result["Cena_EUR"] = round(result["Cena_summa"] * factor, 2)
+                scraped += 1
+                values = [result.get(column, "") for column in COLUMNS]
+                csv_writer.writerow(values)
+                worksheet.write_row(
+                    scraped, 0, ["" if v is None else v for v in values]
+                )
+        finally:
+            workbook.close()
+
+    return {
+        "total_urls": len(request.urls),
+        "scraped": scraped,
+        "failed": failed,
+        "output_csv": request.output_csv,
+        "output_excel": request.output_excel,
+    }
+
+
+@app.on_event("startup")
+async def _start_rates_refresher():
+    asyncio.create_task(_rates_refresher())
+
+
+@app.on_event("shutdown")
+async def _close_session():
+    if _session is not None and not _session.closed:
+        await _session.close()
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,796 @@
+"""Template-driven field extraction from parsed pages.
+
+:class:`SmartFieldExtractor` walks an :class:`ExtractionTemplate` over a
+parsed page — a selectolax tree on the fast path (C parsing and CSS
+selection), or a BeautifulSoup document: CSS selectors first, fallback
+selectors next,
+then the field's regex patterns over the page text, and finally the
+extractor's own generic per-field-type patterns. Extracted values are
+normalized by the ``format_*`` functions a selector names and checked
+against its validation pattern.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup
+
+from fast_kernels import (
+    ANCHOR_DIMENSIONS,
+    ANCHOR_EMAIL,
+    ANCHOR_PRICE,
+    ANCHOR_URL,
+    compact_phone,
+    normalize_email,
+    scan_anchor_flags,
+    strip_commas,
+)
+from field_selector import (
+    ExtractionStrategy,
+    ExtractionTemplate,
+    FieldSelector,
+    FieldType,
+    _compile_soupsieve,
+    soupsieve,
+)
+
+try:
+    import re2
+except ImportError:  # RE2 is optional; stdlib re still works everywhere
+    re2 = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # the BeautifulSoup path still works without it
+    HTMLParser = None
+
+try:
+    import ahocorasick
+except ImportError:  # prefilter degrades to scanning every field type
+    ahocorasick = None
+
+# Syntax RE2 cannot parse (possessive quantifiers, atomic groups); such
+# patterns skip the probe and compile on the backtracking engine.
+_RE2_UNSUPPORTED = ("?+", "*+", "++", "}+", "(?>")
+
+
+def _compile_hot(pattern: str, flags: re.RegexFlag = re.IGNORECASE):
+    """Compile a pattern that will be scanned over whole pages.
+
+    Prefers RE2's linear-time DFA for bulk ``finditer``/``findall`` work,
+    falling back to stdlib ``re`` when RE2 is unavailable or rejects the
+    pattern. Both expose the same matching surface.
+    """
+    if re2 is not None and not any(tok in pattern for tok in _RE2_UNSUPPORTED):
+        prefix = "(?i)" if flags & re.IGNORECASE else ""
+        try:
+            return re2.compile(prefix + pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+
+# Patterns used by the format functions, compiled once at import: the
+# formatters run once per extracted value, so they must not re-enter the
+# re cache on every call. The byte-level phone/email/price work lives in
+# fast_kernels as JIT-compiled loops.
+_PRICE_CURRENCY_RE = re.compile(r"([€£$¥₹])\s?([\d,]+\.?\d*)")
+_PRICE_NUMBER_RE = re.compile(r"[\d,]+\.?\d*")
+_DIMENSION_VALUE_RE = re.compile(r"\d+\.?\d*\s?(?:cm|mm|m|in|inch)?", re.IGNORECASE)
+_RATING_VALUE_RE = re.compile(r"\d\.?\d?")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(slots=True)
+class _PageContext:
+    """Per-page state shared by every field of one extraction call.
+
+    ``doc`` is either a BeautifulSoup document or a selectolax
+    ``HTMLParser`` tree; ``is_tree`` records which once so the per-field
+    loops don't re-check. ``page_text`` serializes the DOM lazily and
+    exactly once; on the selectolax path that is a single C traversal
+    instead of the pure-Python ``soup.get_text()`` walk. ``select``
+    memoizes selector hits, so fields sharing a selector (``.contact``,
+    ``.price``, ...) trigger one CSS walk instead of one per field.
+    """
+
+    doc: Any
+    page_url: str = ""
+    is_tree: bool = False
+    _text: Optional[str] = None
+    _selected: Optional[dict[str, list]] = None
+    _anchor_hits: Optional[frozenset] = None
+
+    def __post_init__(self):
+        self.is_tree = HTMLParser is not None and isinstance(self.doc, HTMLParser)
+
+    @property
+    def page_text(self) -> str:
+        if self._text is None:
+            if self.is_tree:
+                body = self.doc.body or self.doc.root
+                self._text = (
+                    body.text(deep=True, separator=" ") if body is not None else ""
+                )
+            else:
+                self._text = self.doc.get_text(" ")
+        return self._text
+
+    def select(self, selector: str, matcher=None) -> list:
+        if self._selected is None:
+            self._selected = {}
+        elements = self._selected.get(selector)
+        if elements is None:
+            if self.is_tree:
+                elements = self.doc.css(selector)
+            elif matcher is not None:
+                # Pre-compiled soupsieve matcher: no selector re-parse.
+                elements = matcher.select(self.doc)
+            else:
+                elements = self.doc.select(selector)
+            self._selected[selector] = elements
+        return elements
+
+
+# ----------------------------------------------------------------------
+# Value formatters, referenced by name from FieldSelector specs. Free
+# functions rather than methods: the per-value call is just a function
+# call, with no bound-method object created on each lookup.
+# ----------------------------------------------------------------------
+
+
+def format_phone(phone) -> Optional[str]:
+    cleaned = compact_phone(str(phone))
+    digits = cleaned.lstrip("+")
+    if 7 <= len(digits) <= 15:
+        return cleaned
+    return None
+
+
+def format_email(email) -> Optional[str]:
+    return normalize_email(str(email).strip())
+
+
+def format_price(price) -> Optional[str]:
+    text = str(price)
+    match = _PRICE_CURRENCY_RE.search(text)
+    if match:
+        return f"{match.group(1)}{strip_commas(match.group(2))}"
+    match = _PRICE_NUMBER_RE.search(text)
+    if match:
+        return strip_commas(match.group(0))
+    return None
+
+
+def format_dimensions(dimensions) -> Optional[str]:
+    text = _WHITESPACE_RE.sub(" ", str(dimensions)).strip()
+    if _DIMENSION_VALUE_RE.search(text):
+        return text
+    return None
+
+
+def format_address(address) -> Optional[str]:
+    text = _WHITESPACE_RE.sub(" ", str(address)).strip(" ,")
+    return text or None
+
+
+def format_url(url) -> Optional[str]:
+    text = str(url).strip()
+    if text.startswith(("http://", "https://")):
+        return text
+    return None
+
+
+def format_rating(rating) -> Optional[str]:
+    match = _RATING_VALUE_RE.search(str(rating))
+    if match:
+        value = float(match.group(0))
+        if 0.0 <= value <= 5.0:
+            return f"{value:.1f}"
+    return None
+
+
+# Name -> callable, built once at import. FieldSelector specs name their
+# formatter as a string; resolving through this module constant avoids a
+# per-instance dict and keeps field_selector.py free of an import cycle
+# (it cannot depend on this module to store the callable itself).
+_FORMAT_FUNCTIONS = {
+    "format_phone": format_phone,
+    "format_email": format_email,
+    "format_price": format_price,
+    "format_dimensions": format_dimensions,
+    "format_address": format_address,
+    "format_url": format_url,
+    "format_rating": format_rating,
+}
+
+
+# (whole_second, formatted) pair backing _cached_iso_now: pages processed
+# within the same second share one strftime call instead of formatting a
+# fresh timestamp apiece.
+_TS_CACHE: tuple[int, str] = (-1, "")
+
+
+def _cached_iso_now() -> str:
+    """UTC timestamp in ISO-8601 'Z' form, cached per whole second."""
+    global _TS_CACHE
+    now = int(time.time())
+    cached_second, cached_iso = _TS_CACHE
+    if now != cached_second:
+        cached_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _TS_CACHE = (now, cached_iso)
+    return cached_iso
+
+
+# href scheme prefix (and its length) whose remainder is the value for a
+# field type; one dict probe replaces the per-element if/elif chain.
+_HREF_PREFIXES = {
+    FieldType.PHONE: ("tel:", 4),
+    FieldType.EMAIL: ("mailto:", 7),
+}
+
+# Field types whose batch-path scans are gated by scan_anchor_flags bits.
+_ANCHOR_BITS = {
+    FieldType.EMAIL: ANCHOR_EMAIL,
+    FieldType.PRICE: ANCHOR_PRICE,
+    FieldType.DIMENSIONS: ANCHOR_DIMENSIONS,
+    FieldType.URL: ANCHOR_URL,
+}
+
+
+def _finalize_values(values: list, field_selector: FieldSelector) -> Optional[Any]:
+    """Format, validate and collapse raw values into the field's result."""
+    format_func = None
+    if field_selector.format_function:
+        format_func = _FORMAT_FUNCTIONS.get(field_selector.format_function)
+    pattern = field_selector.validation_pattern
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern, re.IGNORECASE)
+
+    if format_func is not None or pattern is not None:
+        # One pass: each value is formatted, checked and kept (or not)
+        # without the intermediate lists the old filter chain built.
+        kept = []
+        append = kept.append
+        for value in values:
+            if format_func is not None:
+                if not value:
+                    continue
+                value = format_func(value)
+                if not value:
+                    continue
+            if pattern is not None and not pattern.match(str(value)):
+                continue
+            append(value)
+        values = kept
+
+    if not values:
+        return None
+    if field_selector.multiple_values:
+        # Deduplicate while keeping first-seen order.
+        return list(dict.fromkeys(values))
+    return values[0]
+
+
+def _finalize_one(value, field_selector: FieldSelector) -> Optional[Any]:
+    """Format and validate a single candidate; ``None`` if it fails."""
+    if field_selector.format_function:
+        format_func = _FORMAT_FUNCTIONS.get(field_selector.format_function)
+        if format_func is not None:
+            value = format_func(value)
+            if not value:
+                return None
+
+    if field_selector.validation_pattern is not None:
+        pattern = field_selector.validation_pattern
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern, re.IGNORECASE)
+        if not pattern.match(str(value)):
+            return None
+    return value
+
+
+def _extract_value_from_element(element, field_selector: FieldSelector) -> Optional[str]:
+    """Pull the raw value out of one matched BeautifulSoup element."""
+    strategy = field_selector.extraction_strategy
+
+    if strategy == ExtractionStrategy.TEXT_CONTENT:
+        # One Tag-tree serialization per element, shared by every pattern.
+        text = element.get_text()
+        if field_selector.regex_patterns:
+            for pattern in field_selector.regex_patterns:
+                match = pattern.search(text)
+                if match:
+                    return match.group(0).strip()
+            return None
+        return text.strip()
+
+    if strategy == ExtractionStrategy.ATTRIBUTE and field_selector.attribute_name:
+        return element.get(field_selector.attribute_name)
+
+    if strategy == ExtractionStrategy.HREF:
+        if element.name == "a":
+            return element.attrs.get("href")
+        return None
+
+    if strategy == ExtractionStrategy.REGEX and field_selector.regex_patterns:
+        text = element.get_text()
+        for pattern in field_selector.regex_patterns:
+            match = pattern.search(text)
+            if match:
+                return match.group(0)
+    return None
+
+
+def _extract_value_from_node(node, field_selector: FieldSelector) -> Optional[str]:
+    """selectolax counterpart of :func:`_extract_value_from_element`.
+
+    ``node.text`` and ``node.attributes`` run in C, so the per-node work
+    here is a fraction of the Tag-wrapper path.
+    """
+    strategy = field_selector.extraction_strategy
+
+    if strategy == ExtractionStrategy.TEXT_CONTENT:
+        text = node.text(deep=True, separator=" ")
+        if field_selector.regex_patterns:
+            for pattern in field_selector.regex_patterns:
+                match = pattern.search(text)
+                if match:
+                    return match.group(0).strip()
+            return None
+        return text.strip()
+
+    if strategy == ExtractionStrategy.ATTRIBUTE and field_selector.attribute_name:
+        return node.attributes.get(field_selector.attribute_name)
+
+    if strategy == ExtractionStrategy.HREF:
+        if node.tag == "a":
+            return node.attributes.get("href")
+        return None
+
+    if strategy == ExtractionStrategy.REGEX and field_selector.regex_patterns:
+        text = node.text(deep=True, separator=" ")
+        for pattern in field_selector.regex_patterns:
+            match = pattern.search(text)
+            if match:
+                return match.group(0)
+    return None
+
+
+class PatternBundle:
+    """Generic matching material for one field type, in fixed slots.
+
+    A slotted record instead of a per-type dict: the hot paths read
+    these as direct attribute loads rather than string-keyed probes.
+    """
+
+    __slots__ = ("patterns", "selectors", "matchers", "compiled", "union", "anchors")
+
+    def __init__(self, patterns, selectors, anchors=()):
+        self.patterns = tuple(patterns)
+        self.selectors = tuple(selectors)
+        self.anchors = tuple(anchors)
+        self.matchers = _compile_soupsieve(self.selectors) if soupsieve else (
+            (None,) * len(self.selectors)
+        )
+        self.compiled = tuple(_compile_hot(pattern) for pattern in self.patterns)
+        # All of a field type's patterns fused into one alternation: the
+        # page text is scanned once per type, and m.lastgroup ("p<i>")
+        # tells which sub-pattern fired.
+        self.union = _compile_hot(
+            "|".join(
+                f"(?P<p{i}>{pattern})" for i, pattern in enumerate(self.patterns)
+            )
+        )
+
+
+# FieldType values are strings, so positional indices come from the
+# declaration order; built once at import.
+_FIELD_TYPE_INDEX = {field_type: i for i, field_type in enumerate(FieldType)}
+
+
+class SmartFieldExtractor:
+    """Extracts template fields from parsed pages.
+
+    Holds the generic per-field-type pattern table and the registry of
+    format functions; one instance is shared per process.
+    """
+
+    __slots__ = ("_field_patterns", "format_functions", "_anchor_ac")
+
+    def __init__(self):
+        self._field_patterns = self._initialize_field_patterns()
+        self.format_functions = _FORMAT_FUNCTIONS
+        self._anchor_ac = self._build_anchor_automaton()
+
+    def _initialize_field_patterns(self) -> list:
+        """Build the generic pattern table, indexed by field-type position.
+
+        Patterns are compiled once here (IGNORECASE) and reused for every
+        page; entries for field types with no generic material are None.
+        """
+        bundles = {
+            FieldType.PHONE: PatternBundle(
+                patterns=[
+                    r"(?:\+\d{1,3}[\s-]?)?(?:\(\d{2,4}\)[\s-]?)?\d[\d\s-]{7,13}\d",
+                ],
+                selectors=["a[href^='tel:']", ".phone", ".telephone", ".contact"],
+            ),
+            FieldType.EMAIL: PatternBundle(
+                patterns=[
+                    r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+                ],
+                selectors=["a[href^='mailto:']", ".email", ".contact"],
+                anchors=["@"],
+            ),
+            FieldType.PRICE: PatternBundle(
+                patterns=[
+                    r"([€£$¥₹])\s?([\d,]+\.?\d*)",
+                    r"\b([\d,]+\.?\d*)\s?(EUR|GBP|USD)\b",
+                ],
+                selectors=["[data-price]", ".price", ".cost", ".amount"],
+                anchors=["€", "£", "$", "¥", "₹", "eur", "gbp", "usd"],
+            ),
+            FieldType.DIMENSIONS: PatternBundle(
+                patterns=[
+                    r"\d+\s?(?:x|×)\s?\d+(?:\s?(?:x|×)\s?\d+)?\s?(?:cm|mm|m|in|inch)",
+                ],
+                selectors=[".dimensions", ".size", ".specs"],
+                anchors=["x", "×"],
+            ),
+            FieldType.ADDRESS: PatternBundle(
+                patterns=[
+                    r"\d{1,5}\s[\w\s.]{3,40}(?:Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr)\b",
+                ],
+                selectors=["address", ".address", "[itemprop='address']"],
+            ),
+            FieldType.URL: PatternBundle(
+                patterns=[
+                    r"https?://[^\s\"'<>]+",
+                ],
+                selectors=["a[href^='http']"],
+                anchors=["http"],
+            ),
+        }
+        table: list[Optional[PatternBundle]] = [None] * len(_FIELD_TYPE_INDEX)
+        for field_type, bundle in bundles.items():
+            table[_FIELD_TYPE_INDEX[field_type]] = bundle
+        return table
+
+    def _build_anchor_automaton(self):
+        """Fuse every field type's anchor tokens into one automaton.
+
+        Anchors are tokens that must appear in any match of that type's
+        patterns (``@`` for emails, a currency marker for prices, ...),
+        stored lowercase. One linear scan of the page then says which
+        anchored field types can possibly match; types with no anchors
+        are always scanned.
+        """
+        if ahocorasick is None:
+            return None
+        anchor_types: dict[str, list[FieldType]] = {}
+        for field_type, index in _FIELD_TYPE_INDEX.items():
+            bundle = self._field_patterns[index]
+            if bundle is None:
+                continue
+            for anchor in bundle.anchors:
+                anchor_types.setdefault(anchor, []).append(field_type)
+        if not anchor_types:
+            return None
+        automaton = ahocorasick.Automaton()
+        for anchor, field_types in anchor_types.items():
+            automaton.add_word(anchor, tuple(field_types))
+        automaton.make_automaton()
+        return automaton
+
+    def _anchored_type_hits(self, ctx: _PageContext) -> Optional[frozenset]:
+        """Anchored field types whose tokens occur on this page.
+
+        Returns ``None`` when the prefilter is unavailable (every type
+        must then be scanned). Computed once per page and cached on the
+        context.
+        """
+        if self._anchor_ac is None:
+            return None
+        if ctx._anchor_hits is None:
+            hits = set()
+            for _, field_types in self._anchor_ac.iter(ctx.page_text.lower()):
+                hits.update(field_types)
+            ctx._anchor_hits = frozenset(hits)
+        return ctx._anchor_hits
+
+    def _may_match(self, field_type: FieldType, ctx: _PageContext) -> bool:
+        """Whether ``field_type``'s regexes can possibly fire on this page."""
+        bundle = self._field_patterns[_FIELD_TYPE_INDEX[field_type]]
+        if bundle is None or not bundle.anchors:
+            return True
+        hits = self._anchored_type_hits(ctx)
+        return hits is None or field_type in hits
+
+    def extract_fields_fast(
+        self,
+        html: str,
+        template: ExtractionTemplate,
+        page_url: str = "",
+    ) -> dict[str, Any]:
+        """Extract every template field, parsing with selectolax.
+
+        Parsing and CSS selection both run in C on this path; falls back
+        to BeautifulSoup when selectolax isn't installed.
+        """
+        if HTMLParser is not None:
+            doc = HTMLParser(html)
+        else:
+            doc = BeautifulSoup(html, "html.parser")
+        return self.extract_fields(doc, template, page_url)
+
+    def extract_fields(
+        self,
+        doc,
+        template: ExtractionTemplate,
+        page_url: str = "",
+    ) -> dict[str, Any]:
+        """Extract every template field from one parsed page.
+
+        ``doc`` may be a BeautifulSoup document or a selectolax
+        ``HTMLParser`` tree; every downstream step dispatches on which.
+        """
+        ctx = _PageContext(doc, page_url)
+        results: dict[str, Any] = {
+            "url": page_url,
+            "template_name": template.name,
+            "extraction_timestamp": _cached_iso_now(),
+        }
+
+        # Completeness is tallied as fields land rather than re-scanning
+        # the result keys afterwards; priority membership is one probe of
+        # the frozenset built at template construction.
+        extracted = 0
+        priority_set = template.priority_set
+        priority_extracted = 0
+        for field_selector in template.fields:
+            value = self.extract_field(doc, field_selector, ctx)
+            if value is not None:
+                results[field_selector.name] = value
+                extracted += 1
+                if field_selector.name in priority_set:
+                    priority_extracted += 1
+
+        results["data_completeness"] = (
+            extracted / len(template.fields) if template.fields else 0.0
+        )
+        if priority_extracted == len(priority_set):
+            results["missing_priority_fields"] = []
+        else:
+            results["missing_priority_fields"] = [
+                name for name in template.priority_fields if name not in results
+            ]
+        return results
+
+    def extract_field(
+        self,
+        doc,
+        field_selector: FieldSelector,
+        ctx: Optional[_PageContext] = None,
+    ) -> Optional[Any]:
+        """Extract one field, trying selectors, then regexes, then generics.
+
+        For single-valued fields each candidate is formatted and
+        validated as it is found, returning on the first survivor; the
+        accumulate-everything path only runs for ``multiple_values``.
+        A tier that produced candidates — valid or not — still
+        suppresses the tiers below it, as the list path always did.
+        """
+        if ctx is None:
+            ctx = _PageContext(doc)
+        single = not field_selector.multiple_values
+        values: list[str] = []
+        extract_value = (
+            _extract_value_from_node if ctx.is_tree else _extract_value_from_element
+        )
+
+        found_raw = False
+        for selector, matcher in zip(
+            field_selector.css_selectors,
+            field_selector.compiled_sv or (None,) * len(field_selector.css_selectors),
+        ):
+            try:
+                elements = ctx.select(selector, matcher)
+            except Exception:
+                continue
+            for element in elements:
+                value = extract_value(element, field_selector)
+                if value:
+                    if single:
+                        final = _finalize_one(value, field_selector)
+                        if final is not None:
+                            return final
+                        found_raw = True
+                    else:
+                        values.append(value)
+        if single and found_raw:
+            return None
+
+        if not values:
+            fallback_sv = field_selector.compiled_fallback_sv or (None,) * len(
+                field_selector.fallback_selectors
+            )
+            for selector, matcher in zip(
+                field_selector.fallback_selectors, fallback_sv
+            ):
+                try:
+                    elements = ctx.select(selector, matcher)
+                except Exception:
+                    continue
+                for element in elements:
+                    value = extract_value(element, field_selector)
+                    if value:
+                        if single:
+                            final = _finalize_one(value, field_selector)
+                            if final is not None:
+                                return final
+                            found_raw = True
+                        else:
+                            values.append(value)
+            if single and found_raw:
+                return None
+
+        if (
+            not values
+            and field_selector.regex_patterns
+            and self._may_match(field_selector.field_type, ctx)
+        ):
+            page_text = ctx.page_text
+            combined = field_selector.combined_pattern
+            if combined is not None:
+                # One fused scan over the page instead of one per pattern.
+                for match in combined.finditer(page_text):
+                    value = match.group(0)
+                    if single:
+                        final = _finalize_one(value, field_selector)
+                        if final is not None:
+                            return final
+                        found_raw = True
+                    else:
+                        values.append(value)
+            else:
+                for pattern in field_selector.regex_patterns:
+                    # Group count is a compile-time property, so the
+                    # str-vs-tuple shape of findall results is known up
+                    # front; finditer avoids materializing either.
+                    has_groups = pattern.groups > 0
+                    for match in pattern.finditer(page_text):
+                        if has_groups:
+                            value = " ".join(g for g in match.groups() if g)
+                        else:
+                            value = match.group(0)
+                        if single:
+                            final = _finalize_one(value, field_selector)
+                            if final is not None:
+                                return final
+                            found_raw = True
+                        else:
+                            values.append(value)
+            if single and found_raw:
+                return None
+
+        if not values:
+            values = self._extract_using_field_patterns(
+                doc, field_selector.field_type, ctx
+            )
+            if single:
+                for value in values:
+                    final = _finalize_one(value, field_selector)
+                    if final is not None:
+                        return final
+                return None
+
+        return _finalize_values(values, field_selector)
+
+    def extract_batch(
+        self,
+        page_texts: list[str],
+        template: ExtractionTemplate,
+    ) -> list[dict[str, Any]]:
+        """Run the text-regex stage of extraction over many pages at once.
+
+        One parallel arena scan (fast_kernels) computes each page's
+        anchor bits up front; the per-page loop then only runs patterns
+        whose anchors are actually present. Selector strategies need a
+        DOM and don't apply here — this is for fetch batches whose
+        serialized text is already in hand.
+        """
+        page_texts = list(page_texts)
+        all_flags = scan_anchor_flags(page_texts)
+        records: list[dict[str, Any]] = []
+        for text, page_flags in zip(page_texts, all_flags):
+            record: dict[str, Any] = {}
+            for field_selector in template.fields:
+                bit = _ANCHOR_BITS.get(field_selector.field_type)
+                if bit is not None and not page_flags & bit:
+                    continue
+                value = self._extract_field_from_text(field_selector, text)
+                if value is not None:
+                    record[field_selector.name] = value
+            records.append(record)
+        return records
+
+    def _extract_field_from_text(
+        self, field_selector: FieldSelector, text: str
+    ) -> Optional[Any]:
+        """Regex-only extraction of one field from serialized page text."""
+        values: list[str] = []
+        if field_selector.regex_patterns:
+            combined = field_selector.combined_pattern
+            if combined is not None:
+                for match in combined.finditer(text):
+                    values.append(match.group(0))
+            else:
+                for pattern in field_selector.regex_patterns:
+                    has_groups = pattern.groups > 0
+                    for match in pattern.finditer(text):
+                        if has_groups:
+                            values.append(
+                                " ".join(g for g in match.groups() if g)
+                            )
+                        else:
+                            values.append(match.group(0))
+        if not values:
+            bundle = self._field_patterns[
+                _FIELD_TYPE_INDEX[field_selector.field_type]
+            ]
+            if bundle is not None:
+                for match in bundle.union.finditer(text):
+                    values.append(match.group(0))
+        return _finalize_values(values, field_selector)
+
+    def _extract_using_field_patterns(
+        self,
+        doc,
+        field_type: FieldType,
+        ctx: Optional[_PageContext] = None,
+    ) -> list[str]:
+        """Generic extraction for a field type with no template hits."""
+        if ctx is None:
+            ctx = _PageContext(doc)
+        bundle = self._field_patterns[_FIELD_TYPE_INDEX[field_type]]
+        if bundle is None:
+            return []
+
+        values: list[str] = []
+        prefix, prefix_len = _HREF_PREFIXES.get(field_type, ("", 0))
+        if ctx.is_tree:
+            for selector in bundle.selectors:
+                for node in ctx.select(selector):
+                    href = node.attributes.get("href") if node.tag == "a" else None
+                    if prefix_len and href is not None and href.startswith(prefix):
+                        values.append(href[prefix_len:])
+                    else:
+                        text = node.text(deep=True, separator=" ").strip()
+                        if text:
+                            values.append(text)
+        else:
+            for selector, matcher in zip(bundle.selectors, bundle.matchers):
+                for element in ctx.select(selector, matcher):
+                    # One attribute lookup per element, not one per check.
+                    href = element.attrs.get("href") if element.name == "a" else None
+                    if prefix_len and href is not None and href.startswith(prefix):
+                        values.append(href[prefix_len:])
+                    else:
+                        text = element.get_text().strip()
+                        if text:
+                            values.append(text)
+
+        if not values and self._may_match(field_type, ctx):
+            page_text = ctx.page_text
+            # Single pass with the fused alternation; the whole-match
+            # span covers whichever sub-pattern fired.
+            for match in bundle.union.finditer(page_text):
+                values.append(match.group(0))
+        return values
+
+
+# Shared extractor instance, mirroring the scraper singleton.
+smart_extractor = SmartFieldExtractor()
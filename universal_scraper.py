@@ -0,0 +1,411 @@
+"""Universal search-and-scrape engine.
+
+Takes a :class:`UniversalSearchRequest`, runs the query against a search
+engine, fetches the matching pages and extracts the requested fields from
+each page. Results can be written out as JSON and/or CSV.
+"""
+
+import asyncio
+import csv
+import functools
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import urljoin
+
+import aiohttp
+import orjson
+from bs4 import BeautifulSoup
+from cachetools import TTLCache
+
+try:
+    import ahocorasick
+except ImportError:  # keyword filtering falls back to per-keyword scans
+    ahocorasick = None
+from pydantic import BaseModel, ConfigDict, field_validator
+
+logger = logging.getLogger(__name__)
+
+SEARCH_URL = "https://html.duckduckgo.com/html/"
+
+# Hosts every scrape touches; pre-resolved once per batch so concurrent
+# jobs don't all fire the same lookups at the resolver.
+KNOWN_HOSTS = ("html.duckduckgo.com",)
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+# Generic per-field extraction patterns used when no template is given.
+FIELD_PATTERNS = {
+    "phone_number": r"(?:\+\d{1,3}[\s-]?)?(?:\(\d{2,4}\)[\s-]?)?\d[\d\s-]{7,13}\d",
+    "email_address": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+    "price": r"([€£$¥₹])\s?([\d,]+\.?\d*)",
+    "dimensions": r"\d+\s?(?:x|×)\s?\d+(?:\s?(?:x|×)\s?\d+)?\s?(?:cm|mm|m|in|inch)",
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _keyword_automaton(include: frozenset, exclude: frozenset):
+    """One Aho-Corasick automaton over a request's include+exclude keywords.
+
+    Replaces N substring scans per page with a single linear pass; cached
+    on the (hashable) keyword sets so repeated requests with the same
+    filters share one automaton.
+    """
+    keywords = include | exclude
+    if ahocorasick is None or not keywords:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+class AsyncTokenBucket:
+    """Token-bucket rate limiter for coroutines.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``;
+    :meth:`acquire` sleeps until a token is available. One bucket shared
+    by all fetches keeps a concurrent batch from bursting past the
+    steady-state request rate.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+class UniversalSearchRequest(BaseModel):
+    """A single search-and-scrape job description.
+
+    Keyword and place collections are normalized to lowercase frozensets
+    at validation time, so the scraper's hot loops get deduplicated,
+    pre-lowercased values with O(1) membership and no per-page
+    re-normalization. Instances are frozen (every field is immutable),
+    so requests are hashable — safe to share across concurrent tasks and
+    usable as cache keys.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    search_query: str
+    extraction_template: Optional[str] = None
+    custom_fields: tuple[str, ...] = ()
+    include_keywords: frozenset[str] = frozenset()
+    exclude_keywords: frozenset[str] = frozenset()
+    cities: frozenset[str] = frozenset()
+    countries: frozenset[str] = frozenset()
+    max_results: int = 10
+    output_formats: tuple[str, ...] = ("json",)
+    output_prefix: str = "scrape_results"
+
+    @field_validator("include_keywords", "exclude_keywords", "cities", "countries")
+    @classmethod
+    def _lowercase(cls, value: frozenset[str]) -> frozenset[str]:
+        return frozenset(item.lower() for item in value)
+
+
+class UniversalScraper:
+    """Drives search, page fetching and field extraction for one process."""
+
+    def __init__(self, timeout: float = 15.0, rate: float = 20.0, burst: int = 40):
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        self._bucket = AsyncTokenBucket(rate=rate, burst=burst)
+        # Fetched pages, shared across all jobs in the process: related
+        # queries (and reruns within the TTL) hit memory instead of the
+        # network. _inflight coalesces concurrent fetches of one URL.
+        self._page_cache: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def aenter(self) -> aiohttp.ClientSession:
+        """Create the shared HTTP session if needed and return it.
+
+        Called eagerly before fanning out so concurrent coroutines don't
+        race to build the session, DNS resolver and TLS context.
+        """
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=1024,
+                        limit_per_host=64,
+                        resolver=aiohttp.AsyncResolver(),
+                        ttl_dns_cache=3600,
+                        keepalive_timeout=30,
+                    ),
+                    timeout=self.timeout,
+                    headers={"User-Agent": USER_AGENT},
+                )
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session, if one was created."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def warm_dns(self, hosts: tuple[str, ...] = KNOWN_HOSTS) -> None:
+        """Resolve the known hosts once, ahead of the request fan-out.
+
+        Populates the resolver cache so N concurrent fetches against the
+        same hosts don't each pay (or race on) a fresh lookup. Failures
+        are ignored; the real requests will surface them.
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.getaddrinfo(host, 443) for host in hosts),
+            return_exceptions=True,
+        )
+
+    @asynccontextmanager
+    async def session_scope(self):
+        """Hold one shared HTTP session open across several scrape calls.
+
+        Every ``search_and_scrape`` inside the ``with`` block reuses the
+        same connector, so DNS, TLS handshakes and keep-alive connections
+        are paid once per batch instead of once per call. The session is
+        closed when the scope exits.
+        """
+        session = await self.aenter()
+        try:
+            yield session
+        finally:
+            await self.aclose()
+
+    async def stream_and_scrape(
+        self, request: UniversalSearchRequest
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield extracted records as their pages finish downloading.
+
+        Records arrive in completion order, so a caller that only needs
+        the first few results can break out early without waiting for
+        (or holding in memory) the rest of the batch.
+        """
+        session = await self.aenter()
+        urls = await self._search(session, request)
+
+        async def fetch_pair(url: str) -> tuple[str, Optional[str]]:
+            return url, await self._fetch_cached(session, url)
+
+        tasks = [asyncio.create_task(fetch_pair(url)) for url in urls]
+        try:
+            for future in asyncio.as_completed(tasks):
+                url, page = await future
+                if page is None:
+                    continue
+                record = self._extract_record(url, page, request)
+                if record is not None:
+                    yield record
+        finally:
+            # Callers may break mid-stream; don't leave fetches running.
+            for task in tasks:
+                task.cancel()
+
+    async def search_and_scrape(self, request: UniversalSearchRequest) -> dict[str, Any]:
+        """Run the full search -> fetch -> extract pipeline for ``request``."""
+        results = [record async for record in self.stream_and_scrape(request)]
+
+        response = {
+            "search_query": request.search_query,
+            "extraction_template": request.extraction_template,
+            "total_results": len(results),
+            "results": results,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        if request.output_formats:
+            # File writing is blocking (and Excel is CPU-bound); run it on
+            # a worker thread so concurrent scrapes keep pumping I/O.
+            await asyncio.to_thread(self._write_outputs, response, request)
+        return response
+
+    async def _search(
+        self, session: aiohttp.ClientSession, request: UniversalSearchRequest
+    ) -> list[str]:
+        """Return up to ``max_results`` result URLs for the search query."""
+        query = request.search_query
+        if request.cities:
+            query += " " + " ".join(sorted(request.cities))
+        if request.countries:
+            query += " " + " ".join(sorted(request.countries))
+        await self._bucket.acquire()
+        try:
+            async with session.post(SEARCH_URL, data={"q": query}) as resp:
+                html = await resp.text()
+        except aiohttp.ClientError as exc:
+            logger.warning("Search request failed for %r: %s", query, exc)
+            return []
+
+        soup = BeautifulSoup(html, "html.parser")
+        urls = []
+        for anchor in soup.select("a.result__a"):
+            href = anchor.get("href")
+            if href and href.startswith("http"):
+                urls.append(urljoin(SEARCH_URL, href))
+            if len(urls) >= request.max_results:
+                break
+        return urls
+
+    async def _fetch_cached(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[str]:
+        """Fetch ``url`` through the page cache, coalescing duplicates.
+
+        A cache hit skips the network entirely; a miss with a fetch
+        already in flight awaits that fetch instead of issuing a second
+        request for the same URL.
+        """
+        try:
+            return self._page_cache[url]
+        except KeyError:
+            pass
+        task = self._inflight.get(url)
+        if task is None:
+
+            async def fetch_and_store() -> Optional[str]:
+                page = await self._fetch(session, url)
+                if page is not None:
+                    self._page_cache[url] = page
+                return page
+
+            task = asyncio.create_task(fetch_and_store())
+            self._inflight[url] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(url, None))
+        return await task
+
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        retries: int = 3,
+        backoff: float = 0.5,
+    ) -> Optional[str]:
+        """Fetch one page, returning its HTML or None on failure.
+
+        Rate-limited through the shared token bucket; 429/503 responses
+        are retried with exponential backoff instead of being dropped.
+        """
+        for attempt in range(retries):
+            await self._bucket.acquire()
+            try:
+                async with session.get(url) as resp:
+                    if resp.status in (429, 503):
+                        await asyncio.sleep(backoff * 2**attempt)
+                        continue
+                    if resp.status != 200:
+                        return None
+                    return await resp.text(errors="replace")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                logger.debug("Fetch failed for %s: %s", url, exc)
+                return None
+        return None
+
+    def _extract_record(
+        self, url: str, html: str, request: UniversalSearchRequest
+    ) -> Optional[dict[str, Any]]:
+        """Extract the requested fields from one page, or None if filtered out."""
+        soup = BeautifulSoup(html, "html.parser")
+        page_text = soup.get_text(" ", strip=True)
+        text_lower = page_text.lower()
+
+        # Keywords arrive pre-lowercased from the request validator. One
+        # automaton pass finds every include/exclude hit; the per-keyword
+        # substring loop only runs when pyahocorasick is missing.
+        automaton = _keyword_automaton(request.include_keywords, request.exclude_keywords)
+        if automaton is not None:
+            hits = {value for _, value in automaton.iter(text_lower)}
+            if hits & request.exclude_keywords:
+                return None
+            if request.include_keywords and not (hits & request.include_keywords):
+                return None
+        else:
+            for keyword in request.exclude_keywords:
+                if keyword in text_lower:
+                    return None
+            if request.include_keywords:
+                if not any(k in text_lower for k in request.include_keywords):
+                    return None
+
+        record: dict[str, Any] = {"url": url}
+        title = soup.find("title")
+        if title is not None:
+            record["name"] = title.get_text(strip=True)
+
+        # A named template gets the one-pass path: a Hyperscan scan over
+        # all its patterns at once, completed by its specialized
+        # codegen'd extractor — no generic dict-driven dispatch per page.
+        if request.extraction_template:
+            from extraction_templates import TemplateLibrary
+
+            extracted = TemplateLibrary.extract(request.extraction_template, page_text)
+            if extracted:
+                record.update(extracted)
+
+        fields = request.custom_fields or list(FIELD_PATTERNS)
+        for field in fields:
+            if field in record:
+                continue
+            pattern = FIELD_PATTERNS.get(field)
+            if pattern is None:
+                continue
+            match = re.search(pattern, page_text, re.IGNORECASE)
+            if match:
+                record[field] = match.group(0).strip()
+        return record
+
+    def _write_outputs(self, response: dict[str, Any], request: UniversalSearchRequest) -> None:
+        """Persist results in each requested output format."""
+        if "json" in request.output_formats:
+            # orjson serializes straight to UTF-8 bytes in C, so write the
+            # file in binary mode and skip the text-mode encoder entirely.
+            with open(f"{request.output_prefix}.json", "wb") as f:
+                f.write(orjson.dumps(response, option=orjson.OPT_INDENT_2, default=str))
+        if "csv" in request.output_formats and response["results"]:
+            columns = sorted({k for row in response["results"] for k in row})
+            with open(f"{request.output_prefix}.csv", "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=columns)
+                writer.writeheader()
+                # writerows consumes the iterable row by row; no second
+                # materialized copy of the result set is built here.
+                writer.writerows(iter(response["results"]))
+        if "excel" in request.output_formats and response["results"]:
+            self._write_excel(f"{request.output_prefix}.xlsx", response["results"])
+
+    def _write_excel(self, path: str, rows: list[dict[str, Any]]) -> None:
+        """Write results as a single-sheet workbook, streaming row by row."""
+        from openpyxl import Workbook  # deferred: only Excel outputs pay it
+
+        columns = sorted({k for row in rows for k in row})
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("results")
+        sheet.append(columns)
+        for row in rows:
+            sheet.append([row.get(column) for column in columns])
+        workbook.save(path)
+
+
+# Shared scraper instance used by the example scripts and the API layer.
+universal_scraper = UniversalScraper()